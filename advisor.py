@@ -0,0 +1,153 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from game_changer import LifeSimulator, RULES
+from montecarlo import first_choice
+from stats import OutcomeStats
+
+# Choice advisor: scores every option of a game's pending event by playing
+# many rollouts of the rest of the life from it, fanned out over worker
+# processes like montecarlo. Each chunk of rollouts loads the state once and
+# plays every rollout on a fork of it. Rollout r of every choice uses the same seed, so
+# choices are compared on common random numbers, and the seeds come from the
+# state's fingerprint: equivalent states give identical advice, which is kept
+# in an LRU keyed by that fingerprint.
+
+ROLLOUTS = 200
+CHUNK_SIZE = 25
+# Not part of the game a state describes: display and bookkeeping fields, and
+# the RNG position, which rollouts replace with their own seeds
+VOLATILE = ('notifications', 'state_version', 'rng_seed', 'rng_epoch')
+
+
+def fingerprint(state):
+    canonical = {key: value for key, value in state.items() if key not in VOLATILE}
+    data = json.dumps(canonical, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+
+def rollout(base, choice, seed, policy=first_choice):
+    # Takes `choice` in a fork of the `base` game and plays on until the
+    # player in control dies; returns None when the choice leaves no one to
+    # play (e.g. a new life not yet created)
+    game = base.fork(seed)
+    game.handle_choice(choice)
+    # Follow-up prompts of the choice itself, such as naming an heir
+    while game.player and not game.player.is_alive and game.current_event and game.current_event['title'] != "Life Complete":
+        game.handle_choice(policy(game))
+    player = game.player
+    if player is None or not player.is_alive:
+        return None
+    while player.is_alive and game.game_active:
+        if game.current_event:
+            game.handle_choice(policy(game))
+        else:
+            game.paused = False
+            game.fast_forward(RULES.death['max_age'])
+    game.sync_world()
+    family = game.family
+    spouse = player.spouse
+    return {
+        'lifespan': player.age,
+        'wealth': player.wealth,
+        'family_assets': game.family_assets,
+        'family_size': (spouse is not None and spouse.is_alive) + sum(family[i].is_alive for i in family.descendants(player.id))
+    }
+
+
+def rollout_chunk(state, key, choice, start, stop, policy=first_choice):
+    base = LifeSimulator.from_dict(state)
+    outcomes = OutcomeStats()
+    for i in range(start, stop):
+        outcomes.add(rollout(base, choice, f"{key}/{i}", policy))
+    return outcomes
+
+
+class Advisor:
+    def __init__(self, rollouts=ROLLOUTS, workers=None, policy=first_choice, chunk_size=CHUNK_SIZE, max_entries=1024):
+        # workers=1 runs in the calling process; policy must be a
+        # module-level function so it can be sent to the workers
+        self.rollouts = rollouts
+        self.workers = workers
+        self.policy = policy
+        self.chunk_size = chunk_size
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def advise(self, state):
+        # Outcome statistics per choice of the pending event in `state` (as
+        # from LifeSimulator.to_dict()), or None when nothing is pending
+        event = state.get('current_event')
+        if not event or not event.get('choices'):
+            return None
+        key = fingerprint(state)
+        with self._lock:
+            advice = self._entries.get(key)
+            if advice is not None:
+                self._entries.move_to_end(key)
+                return dict(advice, cached=True)
+        advice = {
+            'fingerprint': key,
+            'event': event['title'],
+            'choices': [dict(choice, **outcome.to_dict()) for choice, outcome in zip(event['choices'], self.score(state, key, len(event['choices'])))]
+        }
+        with self._lock:
+            self._entries[key] = advice
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return dict(advice, cached=False)
+
+    def score(self, state, key, choices):
+        work = partial(rollout_chunk, state, key, policy=self.policy)
+        tasks = [(choice, start, min(start + self.chunk_size, self.rollouts))
+                 for choice in range(choices) for start in range(0, self.rollouts, self.chunk_size)]
+        outcomes = [OutcomeStats() for _ in range(choices)]
+        if self.workers == 1:
+            chunks = map(work, *zip(*tasks))
+        else:
+            chunks = self.executor().map(work, *zip(*tasks))
+        for (choice, _, _), chunk in zip(tasks, chunks):
+            outcomes[choice].merge(chunk)
+        return outcomes
+
+    def executor(self):
+        # One pool for the advisor's lifetime, started on first use
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+    # Advice on the first event of a sample life: advisor.py [rollouts] [workers]
+    from game_changer import SocioEconomicClass
+    rollouts = int(sys.argv[1]) if len(sys.argv) > 1 else ROLLOUTS
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    game = LifeSimulator(seed=0)
+    game.create_character("Alex", "Smith", "Female", SocioEconomicClass.MIDDLE)
+    game.handle_choice(0)
+    while not game.current_event:
+        game.paused = False
+        game.fast_forward(RULES.death['max_age'])
+    advisor = Advisor(rollouts=rollouts, workers=workers)
+    start = time.perf_counter()
+    advice = advisor.advise(game.to_dict())
+    print(f"Scored {len(advice['choices'])} choices x {rollouts} rollouts in {time.perf_counter() - start:.2f}s")
+    start = time.perf_counter()
+    advisor.advise(game.to_dict())
+    print(f"Cached answer in {(time.perf_counter() - start) * 1000:.2f}ms")
+    advisor.close()
+    print(json.dumps(advice, indent=2))
@@ -1,101 +1,274 @@
-from flask import Flask, render_template, request, redirect, url_for, session
-from game_logic import LifeSimulator, SocioEconomicClass, Nationality, Religion
+from flask import Blueprint, Flask, Response, abort, current_app, g, jsonify, render_template, request, redirect, stream_with_context, url_for, session
+from markupsafe import Markup
+from game_changer import LifeSimulator, SocioEconomicClass, Nationality, Religion
+import metrics
+from advisor import Advisor
+from journal import Journal
+import session_store
+import views
+from session_store import create_store, new_session_id
 from datetime import timedelta
 import json
 import os
 import logging
+import logging_setup
+import secrets
+import time
 
-app = Flask(__name__)
-app.secret_key = os.urandom(24)
-app.permanent_session_lifetime = timedelta(days=1)
+# Settings, overridable from a Python file named by LIFESIM_CONFIG, from
+# LIFESIM_-prefixed environment variables (LIFESIM_SECRET_KEY,
+# LIFESIM_SESSION_STORE, ...) and from the mapping passed to create_app()
+DEFAULT_CONFIG = {
+    'SECRET_KEY': None,
+    'PERMANENT_SESSION_LIFETIME': timedelta(days=1),
+    'SESSION_COOKIE_HTTPONLY': True,
+    'SESSION_COOKIE_SAMESITE': 'Lax',
+    # 'memory' keeps games inside one process; use 'sqlite' with several workers
+    'SESSION_STORE': 'memory',
+    'SESSION_DB': None,
+    # Optional per-game history journals, one file per session id
+    'JOURNAL_DIR': None,
+    'MAX_GAME_SPEED': 50,
+    # Upper bound on years pushed over one /stream connection
+    'STREAM_MAX_YEARS': 150,
+    # Rollouts per choice behind /api/advice, and their worker processes
+    # (None: one per CPU, 1: in the request thread)
+    'ADVISOR_ROLLOUTS': 200,
+    'ADVISOR_WORKERS': None,
+    # Part of every index page ETag; None uses a digest of the templates. Set
+    # it when a deploy changes the page in other ways.
+    'VIEW_VERSION': None
+}
+
+FRAGMENTS = ('player', 'notifications', 'controls', 'event')
 
-# Setup logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
+bp = Blueprint('game', __name__)
+
+
+class GameServices:
+    # Per-app state, kept in app.extensions rather than at module level
+    def __init__(self, config):
+        # Game state is kept server-side; the cookie only carries the session id
+        self.store = create_store(
+            config['SESSION_STORE'],
+            ttl=config['PERMANENT_SESSION_LIFETIME'].total_seconds(),
+            path=config['SESSION_DB']
+        )
+        # Index page views and card fragments, keyed by (sid, state_version)
+        self.view_cache = views.ViewCache()
+        self.view_version = config['VIEW_VERSION']
+        self.journal_dir = config['JOURNAL_DIR']
+        self.advisor = Advisor(rollouts=config['ADVISOR_ROLLOUTS'], workers=config['ADVISOR_WORKERS'])
+
 
-@app.template_filter('format_number')
+def create_app(config=None):
+    app = Flask(__name__, template_folder='Templates')
+    app.config.update(DEFAULT_CONFIG)
+    app.config.from_envvar('LIFESIM_CONFIG', silent=True)
+    app.config.from_prefixed_env('LIFESIM')
+    if config:
+        app.config.update(config)
+    if isinstance(app.config['PERMANENT_SESSION_LIFETIME'], (int, float)):
+        app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(seconds=app.config['PERMANENT_SESSION_LIFETIME'])
+    if not app.config['SECRET_KEY']:
+        # Every process must sign sessions with the same key
+        if not (app.config.get('DEBUG') or app.config.get('TESTING')):
+            raise RuntimeError("Set LIFESIM_SECRET_KEY (or SECRET_KEY in LIFESIM_CONFIG) before serving")
+        logger.warning("No SECRET_KEY configured; using a random key valid for this process only")
+        app.config['SECRET_KEY'] = secrets.token_hex(32)
+    if not app.config['VIEW_VERSION']:
+        app.config['VIEW_VERSION'] = views.template_version(os.path.join(app.root_path, app.template_folder))
+    logging_setup.configure()
+    app.extensions['lifesim'] = GameServices(app.config)
+    app.register_blueprint(bp)
+    return app
+
+
+def services():
+    return current_app.extensions['lifesim']
+
+@bp.app_template_filter('format_number')
 def format_number(value):
     return "{:,}".format(int(value))
 
+@bp.before_app_request
+def start_request_timer():
+    if metrics.enabled:
+        g.request_start = time.perf_counter()
+
+@bp.after_app_request
+def record_request_latency(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        metrics.REQUEST_SECONDS.observe(time.perf_counter() - start, route=request.endpoint or 'unmatched')
+    return response
+
+@bp.route('/metrics')
+def metrics_endpoint():
+    if not metrics.enabled:
+        abort(404)
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+def render(template, **context):
+    with metrics.PHASE_SECONDS.time(phase='render'):
+        return render_template(template, **context)
+
+def attach_journal(game, sid):
+    journal_dir = services().journal_dir
+    if journal_dir and sid:
+        game.journal = Journal(os.path.join(journal_dir, f"{sid}.journal"))
+    return game
+
 def get_game():
-    if 'game' not in session:
-        logger.debug("No game in session, creating new LifeSimulator")
-        return LifeSimulator()
-    
+    sid = session.get('sid')
     try:
-        game_data = session['game']
-        if isinstance(game_data, str):
-            game_data = json.loads(game_data)
-        game = LifeSimulator.from_dict(game_data)
+        game = session_store.load_game(services().store, sid, LifeSimulator) if sid else None
+        if game is None:
+            logger.debug("No game in session, creating new LifeSimulator")
+            return LifeSimulator()
         logger.debug("Loaded game from session")
-        return game
+        return attach_journal(game, sid)
     except (json.JSONDecodeError, AttributeError, KeyError) as e:
-        logger.error(f"Error loading game from session: {e}")
+        logger.error("Error loading game from session: %s", e)
         return LifeSimulator()
 
 def save_game(game):
     try:
-        session['game'] = game.to_dict()
-        session.modified = True
+        if 'sid' not in session:
+            session['sid'] = new_session_id()
+            session.permanent = True
+        session_store.save_game(services().store, session['sid'], game)
         logger.debug("Game state saved to session")
     except Exception as e:
-        logger.error(f"Error saving game to session: {e}")
+        logger.error("Error saving game to session: %s", e)
 
-@app.route('/')
+@bp.route('/')
 def index():
-    game = get_game()
-    if not game.player:
+    # Served from the stored state: an unchanged game is answered with 304,
+    # otherwise the page is assembled from cached card fragments
+    sid = session.get('sid')
+    try:
+        entry = session_store.load_state(services().store, sid) if sid else None
+    except (json.JSONDecodeError, AttributeError, KeyError) as e:
+        logger.error("Error loading game from session: %s", e)
+        entry = None
+    if entry is None or entry[0].get('player_id') is None:
         logger.debug("No player found, redirecting to character creation")
-        return redirect(url_for('character_creation'))
-    return render_template('index.html', game=game, SocioEconomicClass=SocioEconomicClass)
+        return redirect(url_for('.character_creation'))
+    state = entry[0]
+    version = state.get('state_version', 0)
+    etag = views.etag(services().view_version, sid, version)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        view = services().view_cache.get((sid, version, 'view'), lambda: views.build_view(state))
+        fragments = {name: fragment(sid, version, name, view) for name in FRAGMENTS}
+        response = Response(render('index.html', view=view, fragments=fragments))
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def fragment(sid, version, name, view):
+    if name == 'event' and not view['event']:
+        return None
+    return services().view_cache.get((sid, version, name), lambda: Markup(render(f'cards/{name}.html', view=view)))
 
-# ... (rest of app.py remains the same up to /character route)
 
-@app.route('/character', methods=['GET', 'POST'])
+CHARACTER_FIELDS = ('first_name', 'last_name', 'gender', 'socio_class', 'nationality', 'religion')
+
+def new_character(game, data):
+    # Starts a fresh session and creates the character described by `data`
+    # (form fields or API JSON)
+    socio_class = data.get('socio_class', 'MIDDLE')
+    nationality = data.get('nationality', 'AMERICAN')
+    religion = data.get('religion', 'NONE')
+    first_name = data.get('first_name', 'Alex')
+    last_name = data.get('last_name', 'Smith')
+    gender = data.get('gender', 'Non-Binary')
+
+    logger.debug("Form data: first_name=%s, last_name=%s, gender=%s, socio_class=%s, nationality=%s, religion=%s",
+                 first_name, last_name, gender, socio_class, nationality, religion)
+
+    try:
+        socio_class = SocioEconomicClass[socio_class]
+        nationality = Nationality[nationality]
+        religion = Religion[religion]
+    except KeyError as e:
+        logger.warning("Invalid enum value: %s, using defaults", e)
+        socio_class = SocioEconomicClass.MIDDLE
+        nationality = Nationality.AMERICAN
+        religion = Religion.NONE
+
+    # Clear session to ensure fresh state
+    if 'sid' in session:
+        services().store.delete(session['sid'])
+    session.clear()
+    logger.debug("Session cleared before creating new character")
+    session['sid'] = new_session_id()
+    session.permanent = True
+    attach_journal(game, session['sid'])
+
+    game.create_character(
+        first_name=first_name,
+        last_name=last_name,
+        gender=gender,
+        socio_class=socio_class,
+        nationality=nationality,
+        religion=religion
+    )
+
+def apply_action(game, action, data):
+    # Shared by the form routes and the JSON API; returns False for an
+    # unknown action. Bad numbers raise ValueError, and values of the wrong
+    # type TypeError.
+    if action == 'pause':
+        game.paused = not game.paused
+        logger.debug("Game paused: %s", game.paused)
+    elif action == 'speed':
+        game.game_speed = max(1, min(current_app.config['MAX_GAME_SPEED'], int(data.get('speed', 1))))
+        logger.debug("Game speed set to: %s", game.game_speed)
+    elif action == 'advance':
+        if not game.paused:
+            game.update()
+            logger.debug("Advanced one year")
+    elif action == 'fast_forward':
+        if not game.paused:
+            notes = game.fast_forward()
+            logger.debug("Fast-forwarded to age %s with %s notifications", game.player.age, len(notes))
+    elif action == 'choice':
+        choice_index = int(data.get('choice', 0))
+        if choice_index < 0:
+            raise ValueError(choice_index)
+        game.handle_choice(choice_index)
+        logger.debug("Handled choice: %s", choice_index)
+    elif action == 'name':
+        if game.current_event:
+            new_name = data.get('new_name', "Child")
+            if not isinstance(new_name, str):
+                raise TypeError(new_name)
+            game.current_event = dict(game.current_event, new_name=new_name)
+            logger.debug("Next gen name set to: %s", game.current_event['new_name'])
+            game.handle_choice(0)
+    else:
+        return False
+    return True
+
+@bp.route('/character', methods=['GET', 'POST'])
 def character_creation():
     game = get_game()
     
     if request.method == 'POST':
         logger.debug("Received POST request for character creation")
-        socio_class = request.form.get('socio_class', 'MIDDLE')
-        nationality = request.form.get('nationality', 'AMERICAN')
-        religion = request.form.get('religion', 'NONE')
-        first_name = request.form.get('first_name', 'Alex')
-        last_name = request.form.get('last_name', 'Smith')
-        gender = request.form.get('gender', 'Non-Binary')
-
-        logger.debug(f"Form data: first_name={first_name}, last_name={last_name}, gender={gender}, socio_class={socio_class}, nationality={nationality}, religion={religion}")
-
-        try:
-            socio_class = SocioEconomicClass[socio_class]
-            nationality = Nationality[nationality]
-            religion = Religion[religion]
-        except KeyError as e:
-            logger.warning(f"Invalid enum value: {e}, using defaults")
-            socio_class = SocioEconomicClass.MIDDLE
-            nationality = Nationality.AMERICAN
-            religion = Religion.NONE
-        
-        # Clear session to ensure fresh state
-        session.clear()
-        logger.debug("Session cleared before creating new character")
-
-        game.create_character(
-            first_name=first_name,
-            last_name=last_name,
-            gender=gender,
-            socio_class=socio_class,
-            nationality=nationality,
-            religion=religion
-        )
+        new_character(game, request.form)
         logger.debug("Character created, saving game")
         save_game(game)
         if game.player:
-            logger.debug(f"Player created: {game.player.full_name()}, redirecting to index")
-            return redirect(url_for('index'))
+            logger.debug("Player created: %s %s, redirecting to index", game.player.first_name, game.player.last_name)
+            return redirect(url_for('.index'))
         else:
             logger.error("Player creation failed, staying on character page")
-            return render_template(
+            return render(
                 'character.html',
                 socio_classes=[c.name for c in SocioEconomicClass],
                 nationalities=[n.name for n in Nationality],
@@ -104,71 +277,172 @@ def character_creation():
             )
     
     logger.debug("Rendering character creation page")
-    return render_template(
+    return render(
         'character.html',
         socio_classes=[c.name for c in SocioEconomicClass],
         nationalities=[n.name for n in Nationality],
         religions=[r.name for r in Religion]
     )
 
-# ... (rest of app.py remains the same)
 
-@app.route('/advance', methods=['POST'])
+@bp.route('/advance', methods=['POST'])
 def advance_year():
     game = get_game()
-    action = request.form.get('action', '')
-    
-    if action == 'pause':
-        game.paused = not game.paused
-        logger.debug(f"Game paused: {game.paused}")
-    elif action == 'speed':
-        game.game_speed = int(request.form.get('speed', 1))
-        logger.debug(f"Game speed set to: {game.game_speed}")
-    elif action == 'advance':
-        if not game.paused:
-            game.update()
-            logger.debug("Advanced one year")
-    elif action == 'choice':
-        choice_index = int(request.form.get('choice', 0))
-        game.handle_choice(choice_index)
-        logger.debug(f"Handled choice: {choice_index}")
-    
+    apply_action(game, request.form.get('action', ''), request.form)
     save_game(game)
-    return redirect(url_for('index'))
+    return redirect(url_for('.index'))
 
-# ... (rest of app.py unchanged up to handle_event)
 
-@app.route('/event', methods=['GET', 'POST'])
+@bp.route('/event', methods=['GET', 'POST'])
 def handle_event():
     game = get_game()
     if request.method == 'POST':
         if 'new_name' in request.form:  # Handle next gen name input
-            game.current_event['new_name'] = request.form['new_name']
-            logger.debug(f"Next gen name set to: {request.form['new_name']}")
-            game.handle_choice(0)
+            apply_action(game, 'name', request.form)
         else:
             choice_index = int(request.form.get('choice', 0))
-            logger.debug(f"Event choice made: {choice_index}, action: {game.current_event['choices'][choice_index]['action']}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Event choice made: %s, action: %s", choice_index, game.current_event['choices'][choice_index]['action'])
             game.handle_choice(choice_index)
         save_game(game)
-        return redirect(url_for('index'))
+        return redirect(url_for('.index'))
     currency_code, currency_symbol = game.get_currency()
-    return render_template('event.html', event=game.current_event, currency_symbol=currency_symbol, currency_code=currency_code)
+    return render('event.html', event=game.current_event, currency_symbol=currency_symbol, currency_code=currency_code)
 
-# ... (rest of app.py unchanged)
 
-@app.route('/death', methods=['GET', 'POST'])
+@bp.route('/death', methods=['GET', 'POST'])
 def death_screen():
     game = get_game()
     if request.method == 'POST':
         action = request.form.get('action')
         choice_index = next((i for i, choice in enumerate(game.current_event['choices']) if choice['action'] == action), 0)
         game.handle_choice(choice_index)
-        logger.debug(f"Death choice made: {action}")
+        logger.debug("Death choice made: %s", action)
         save_game(game)
-        return redirect(url_for('index'))
+        return redirect(url_for('.index'))
     
-    return render_template('death.html', game=game)
+    return render('death.html', game=game)
+
+# JSON API: one request per step, answered with what changed instead of a
+# redirect and a full page render
+
+def api_error(message, status):
+    return jsonify(error=message), status
+
+def json_body():
+    # The request's JSON object ({} without a body), or None for any other
+    # JSON value
+    data = request.get_json(silent=True)
+    if data is None:
+        return {}
+    return data if isinstance(data, dict) else None
+
+def api_changes(game):
+    # Must run before save_game(), which clears the dirty fields. Events and
+    # notifications are returned on their own; the RNG epoch is internal.
+    changes = game.to_delta()
+    for name in ('notifications', 'current_event', 'rng_epoch'):
+        changes.pop(name, None)
+    return {
+        'changes': changes,
+        'notifications': game.new_notifications,
+        'event': game.current_event
+    }
+
+@bp.route('/api/state')
+def api_state():
+    game = get_game()
+    if not game.player:
+        return api_error("No character", 404)
+    currency_code, currency_symbol = game.get_currency()
+    return jsonify(state=game.to_dict(), currency={'code': currency_code, 'symbol': currency_symbol})
+
+@bp.route('/api/advice')
+def api_advice():
+    # Expected outcome of each choice of the pending event
+    game = get_game()
+    if not game.player:
+        return api_error("No character", 404)
+    advice = services().advisor.advise(game.to_dict())
+    if advice is None:
+        return api_error("No event pending", 409)
+    return jsonify(advice)
+
+@bp.route('/api/character', methods=['POST'])
+def api_character():
+    data = json_body()
+    if data is None:
+        return api_error("Expected a JSON object", 400)
+    wrong = [name for name in CHARACTER_FIELDS if not isinstance(data.get(name, ''), str)]
+    if wrong:
+        return api_error(f"Must be strings: {', '.join(wrong)}", 400)
+    game = get_game()
+    new_character(game, data)
+    save_game(game)
+    return jsonify(state=game.to_dict(), notifications=game.new_notifications, event=game.current_event)
+
+@bp.route('/api/action', methods=['POST'])
+def api_action():
+    game = get_game()
+    if not game.player:
+        return api_error("No character", 409)
+    data = json_body()
+    if data is None:
+        return api_error("Expected a JSON object", 400)
+    action = data.get('action', '')
+    if not isinstance(action, str):
+        return api_error("Expected an action name", 400)
+    try:
+        if not apply_action(game, action, data):
+            return api_error(f"Unknown action '{action}'", 400)
+    except (TypeError, ValueError):
+        return api_error(f"Invalid arguments for '{action}'", 400)
+    response = api_changes(game)
+    save_game(game)
+    return jsonify(response)
+
+# Live mode: Server-Sent Events ticking the game at game_speed years per
+# second. The game is reloaded before every year, so pausing or changing the
+# speed from another request takes effect on the next tick.
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+def stop_reason(game):
+    if not game.player:
+        return 'no_character'
+    if not game.player.is_alive:
+        return 'dead'
+    if game.current_event:
+        return 'event'
+    if game.paused or not game.game_active:
+        return 'paused'
+    return None
+
+@bp.route('/stream')
+def stream():
+    if 'sid' not in session:
+        return api_error("No character", 404)
+
+    @stream_with_context
+    def years():
+        for _ in range(current_app.config['STREAM_MAX_YEARS']):
+            game = get_game()
+            reason = stop_reason(game)
+            if reason is None:
+                game.update()
+                changes = api_changes(game)
+                save_game(game)
+                yield sse('year', changes)
+                reason = stop_reason(game)
+            if reason:
+                yield sse('stop', {'reason': reason, 'event': game.current_event})
+                return
+            time.sleep(1 / game.game_speed)
+        yield sse('stop', {'reason': 'limit', 'event': None})
+
+    return Response(years(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    create_app({'DEBUG': True}).run(debug=True, threaded=True)
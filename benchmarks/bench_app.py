@@ -0,0 +1,81 @@
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from harness import measure, print_results, save_results
+
+# End-to-end request benchmarks through Flask's test client: GET /, POST
+# /advance and POST /event, including session load and save. Payload bytes are
+# the session cookie plus the game state kept in the session store.
+
+CHARACTER = {'first_name': "Alex", 'last_name': "Smith", 'gender': "Female",
+             'socio_class': 'WEALTHY', 'nationality': 'AMERICAN', 'religion': 'NONE'}
+
+
+app = create_app({'TESTING': True})
+store = app.extensions['lifesim'].store
+
+
+class Player:
+    def __init__(self):
+        self.client = app.test_client()
+        self.new_life()
+
+    def new_life(self):
+        self.client.post('/character', data=CHARACTER)
+        self.client.post('/event', data={'choice': '0'})
+
+    def game_state(self):
+        with self.client.session_transaction() as session:
+            return store.load(session['sid'])[0]
+
+    def cookie_bytes(self):
+        cookie = self.client.get_cookie(app.config['SESSION_COOKIE_NAME'])
+        return len(cookie.value) if cookie else 0
+
+    def payload_bytes(self):
+        return self.cookie_bytes() + len(json.dumps(self.game_state()))
+
+    def ready(self, _=None):
+        # Alive, with no event waiting
+        state = self.game_state()
+        if state['current_event'] and state['current_event']['title'] == "Life Complete":
+            self.new_life()
+        elif state['current_event']:
+            self.client.post('/event', data={'choice': '0'})
+        return self
+
+    def with_event(self, _=None):
+        # Advance until a choice is pending
+        while True:
+            state = self.game_state()
+            if state['current_event'] and state['current_event']['title'] == "Life Complete":
+                self.new_life()
+            elif state['current_event']:
+                return self
+            else:
+                self.client.post('/advance', data={'action': 'advance'})
+
+
+def main(iterations=1000):
+    logging.disable(logging.CRITICAL)
+    player = Player()
+    results = []
+    results.append(measure('GET /', lambda p: p.client.get('/'), iterations, setup=player.ready,
+                           payload_bytes=player.payload_bytes()))
+    results.append(measure('POST /advance', lambda p: p.client.post('/advance', data={'action': 'advance'}),
+                           iterations, setup=player.ready, payload_bytes=player.payload_bytes()))
+    results.append(measure('POST /event', lambda p: p.client.post('/event', data={'choice': '0'}),
+                           iterations, setup=player.with_event, payload_bytes=player.payload_bytes()))
+    logging.disable(logging.NOTSET)
+    return results
+
+
+if __name__ == '__main__':
+    results = main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
+    print_results(results)
+    print(f"Saved {save_results(results)}")
@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_changer import LifeSimulator, SocioEconomicClass, Nationality, Religion
+from events import registry
+from montecarlo import simulate_life
+from harness import measure, print_results, save_results
+
+# Engine benchmarks: one update() tick, a whole life, every choice action and
+# to_dict()/from_dict() round-trips for growing families. All games are seeded,
+# so runs do the same work.
+
+FAMILY_SIZES = (0, 10, 100)
+
+
+def adult_game(seed=0, children=0):
+    game = LifeSimulator(seed=seed)
+    game.create_character("Alex", "Smith", "Female", SocioEconomicClass.WEALTHY, Nationality.AMERICAN, Religion.NONE)
+    game.handle_choice(0)
+    game.player.age = 30
+    game.player.wealth = 10 ** 6
+    game.player.job = "Teacher"
+    game.player.salary = 2000
+    game.player.spouse = game.generate_person(age=30)
+    game.player.is_married = True
+    for _ in range(children):
+        game.player.add_child(game.generate_person(age=5))
+    game.current_event = None
+    return game
+
+
+def play_life(game):
+    game.create_character("Alex", "Smith", "Female", SocioEconomicClass.MIDDLE)
+    game.handle_choice(0)
+    while True:
+        if game.current_event:
+            if game.current_event['title'] == "Life Complete":
+                return game
+            game.handle_choice(0)
+        else:
+            game.update()
+
+
+def choice_for(name):
+    return {'text': name, 'action': name, 'job': "Nurse", 'salary': 2500,
+            'nationality': str(Nationality.BRITISH), 'religion': str(Religion.BUDDHISM)}
+
+
+def bench_update(iterations):
+    template = adult_game().to_dict()
+    return measure('update', lambda game: game.update(), iterations,
+                   setup=lambda i: LifeSimulator.from_dict(template))
+
+
+def bench_full_life(iterations):
+    return [
+        measure('full_life.update', play_life, iterations, setup=lambda i: LifeSimulator(seed=i)),
+        measure('full_life.fast_forward', simulate_life, iterations, setup=lambda i: i)
+    ]
+
+
+def bench_choices(iterations):
+    template = adult_game(children=2).to_dict()
+    results = []
+    for name in sorted(registry.actions):
+        def setup(i, name=name):
+            game = LifeSimulator.from_dict(template)
+            game.current_event = {'title': name, 'description': "Transition as Male.", 'new_name': "Sam",
+                                  'choices': [choice_for(name)]}
+            return game
+        results.append(measure(f'handle_choice.{name}', lambda game: game.handle_choice(0), iterations, setup=setup))
+    return results
+
+
+def bench_round_trip(iterations):
+    results = []
+    for size in FAMILY_SIZES:
+        game = adult_game(children=size)
+        payload = len(json.dumps(game.to_dict()))
+        results.append(measure(f'round_trip.children_{size}', lambda _: LifeSimulator.from_dict(game.to_dict()),
+                               iterations, payload_bytes=payload))
+    return results
+
+
+def main(iterations=2000):
+    results = [bench_update(iterations)]
+    results += bench_full_life(max(1, iterations // 20))
+    results += bench_choices(iterations)
+    results += bench_round_trip(iterations)
+    return results
+
+
+if __name__ == '__main__':
+    results = main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
+    print_results(results)
+    print(f"Saved {save_results(results)}")
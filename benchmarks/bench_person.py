@@ -0,0 +1,84 @@
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_changer import Person, EducationLevel, Nationality, Religion
+
+# Compares the slotted Person against the original plain-__dict__ class:
+# bytes per instance (via tracemalloc), both new and as loaded from a saved
+# game (from_dict() then clear_dirty(), the state every Person of a running
+# session is in), and construction throughput.
+
+
+class LegacyPerson:
+    def __init__(self, first_name, last_name, gender, birth_year, family_wealth=50000, family_education=EducationLevel.HIGH_SCHOOL, nationality=Nationality.AMERICAN, religion=Religion.NONE, health=80, intelligence=60):
+        self.first_name = first_name
+        self.last_name = last_name
+        self.gender = gender
+        self.birth_year = birth_year
+        self.age = 0
+        self.is_alive = True
+        self.health = health
+        self.happiness = 50
+        self.intelligence = intelligence
+        self.charisma = 50
+        self.wealth = family_wealth * 0.2
+        self.education = None
+        self.job = None
+        self.salary = 0
+        self.spouse = None
+        self.children = []
+        self.family_wealth = family_wealth
+        self.family_education = family_education
+        self.nationality = nationality
+        self.religion = religion
+        self.is_married = False
+
+
+FIRST_NAMES = ["James", "John", "Mary", "Jennifer", "Alex", "Taylor"]
+
+
+def make(cls, i):
+    # Names built at runtime, as they are when loaded from a session
+    return cls(''.join(FIRST_NAMES[i % 6]), ''.join(["Smith"]), ''.join(["Female"]), 1990, family_wealth=40000 + i, health=70, intelligence=60)
+
+
+def load(cls, data):
+    # The legacy class kept no saved state: loading built it like a new one
+    if cls is LegacyPerson:
+        return make(cls, data)
+    person = cls.from_dict(data)
+    person.clear_dirty()
+    return person
+
+
+def bytes_per_person(build, args):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    people = [build(arg) for arg in args]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del people
+    return (after - before) / len(args)
+
+
+def construction_rate(cls, count):
+    seconds = min(timeit.repeat(lambda: [make(cls, i) for i in range(count)], number=1, repeat=5))
+    return count / seconds
+
+
+def main(count=100000):
+    # Saved states are built before measuring, with their own name strings
+    saved = [make(Person, i).to_dict() for i in range(count)]
+    print(f"{'class':<14}{'new bytes':>12}{'loaded bytes':>14}{'persons/s':>14}")
+    for cls in (LegacyPerson, Person):
+        new = bytes_per_person(lambda i: make(cls, i), range(count))
+        loaded = bytes_per_person(lambda data: load(cls, data), range(count) if cls is LegacyPerson else saved)
+        print(f"{cls.__name__:<14}{new:>12.1f}{loaded:>14.1f}{construction_rate(cls, count):>14,.0f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,61 @@
+import json
+import os
+import platform
+import time
+from datetime import datetime
+
+# Shared timing helpers for the benchmark suite. Each benchmark times single
+# calls with perf_counter so it can report latency percentiles as well as
+# throughput; per-call setup runs outside the timed region.
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def measure(name, fn, iterations, setup=None, warmup=10, **extra):
+    # fn(arg) is timed, where arg = setup(i) if a setup is given
+    for i in range(min(warmup, iterations)):
+        fn(setup(i) if setup else None)
+    latencies = []
+    for i in range(iterations):
+        arg = setup(i) if setup else None
+        start = time.perf_counter()
+        fn(arg)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    total = sum(latencies)
+    result = {
+        'name': name,
+        'iterations': iterations,
+        'ops_per_s': iterations / total if total else None,
+        'p50_us': percentile(latencies, 0.5) * 1e6,
+        'p99_us': percentile(latencies, 0.99) * 1e6
+    }
+    result.update(extra)
+    return result
+
+
+def print_results(results):
+    print(f"{'benchmark':<40}{'ops/s':>12}{'p50 us':>12}{'p99 us':>12}{'bytes':>10}")
+    for r in results:
+        print(f"{r['name']:<40}{r['ops_per_s']:>12,.0f}{r['p50_us']:>12,.1f}{r['p99_us']:>12,.1f}{r.get('payload_bytes', ''):>10}")
+
+
+def save_results(results, path=None):
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return path
@@ -0,0 +1,18 @@
+import sys
+
+import bench_app
+import bench_engine
+from harness import print_results, save_results
+
+# Runs the engine and request benchmarks and saves one JSON report, by
+# default to benchmarks/results/<timestamp>.json
+
+
+def main(iterations=1000, path=None):
+    results = bench_engine.main(iterations) + bench_app.main(iterations)
+    print_results(results)
+    print(f"Saved {save_results(results, path)}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000, sys.argv[2] if len(sys.argv) > 2 else None)
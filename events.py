@@ -0,0 +1,175 @@
+from bisect import bisect_right
+from collections import namedtuple
+
+# Registry of yearly events and of the actions their choices trigger.
+#
+# An event declares when it can happen (a fixed age, or an age window with a
+# yearly chance plus an optional eligibility check on the player's LifeState)
+# and a builder that sets game.current_event. An action handler is called as
+# handler(game, choice) when the player picks a choice whose 'action' matches.
+# Event packs register with the module-level decorators and need no changes
+# to game_changer.py:
+#
+#     import events
+#
+#     @events.event('lottery', min_age=18, chance=0.01)
+#     def lottery_event(game):
+#         game.current_event = {..., 'choices': [{'text': "Play", 'action': 'play_lottery'}]}
+#
+#     @events.action('play_lottery')
+#     def play_lottery(game, choice):
+#         ...
+#
+# Each year at most one random event fires, chosen by a single weighted draw:
+# an event's chance is the probability that it is the one that fires, and the
+# remainder is the probability of a quiet year. The eligible events only depend
+# on the age band and LifeState, so an alias table is built once per bucket.
+
+EventType = namedtuple('EventType', 'name build at_age min_age max_age chance eligible')
+# Per-bucket tables: `any_event` includes the quiet year (None), `events` is
+# conditioned on some event firing, `chance` is the yearly event probability
+Bucket = namedtuple('Bucket', 'any_event events chance')
+LifeState = namedtuple('LifeState', 'relationship employed has_children')
+
+SINGLE, DATING, MARRIED = 'single', 'dating', 'married'
+
+
+def life_state(player):
+    if player.is_married:
+        relationship = MARRIED
+    elif player.spouse:
+        relationship = DATING
+    else:
+        relationship = SINGLE
+    return LifeState(relationship, bool(player.job), bool(player.children))
+
+
+class AliasTable:
+    # Vose's alias method: O(n) to build, one uniform draw per sample
+    def __init__(self, outcomes, weights):
+        total = sum(weights)
+        n = len(outcomes)
+        self.outcomes = tuple(outcomes)
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+        scaled = [w * n / total for w in weights]
+        small = [i for i, w in enumerate(scaled) if w < 1]
+        large = [i for i, w in enumerate(scaled) if w >= 1]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1 - scaled[s]
+            (small if scaled[l] < 1 else large).append(l)
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def draw(self, rng):
+        u = rng.random() * len(self.outcomes)
+        i = int(u)
+        return self.outcomes[i] if u - i < self.prob[i] else self.outcomes[self.alias[i]]
+
+
+class EventRegistry:
+    def __init__(self):
+        self.events = {}
+        self.milestones = {}
+        self.actions = {}
+        self._invalidate()
+
+    def _invalidate(self):
+        self._tables = {}
+        bounds = set()
+        for event_type in self.events.values():
+            if event_type.at_age is None:
+                bounds.add(event_type.min_age)
+                if event_type.max_age is not None:
+                    bounds.add(event_type.max_age + 1)
+        self._bands = sorted(bounds)
+        self._boundaries = sorted(bounds | set(self.milestones))
+
+    def event(self, name, at_age=None, min_age=0, max_age=None, chance=1.0, eligible=None, rules=None):
+        # `rules` is an EventRules entry from rules.json supplying the age
+        # window and chance
+        if rules is not None:
+            min_age, max_age, chance = rules.min_age, rules.max_age, rules.chance
+
+        def register(build):
+            if name in self.events:
+                raise ValueError(f"Event '{name}' is already registered")
+            event_type = EventType(name, build, at_age, min_age, max_age, chance, eligible)
+            self.events[name] = event_type
+            if at_age is not None:
+                self.milestones.setdefault(at_age, event_type)
+            self._invalidate()
+            return build
+        return register
+
+    def action(self, *names):
+        def register(handler):
+            for name in names:
+                if name in self.actions:
+                    raise ValueError(f"Action '{name}' is already registered")
+                self.actions[name] = handler
+            return handler
+        return register
+
+    def bucket(self, age, state):
+        band = bisect_right(self._bands, age)
+        key = (band, state)
+        bucket = self._tables.get(key)
+        if bucket is None:
+            bucket = self._tables[key] = self._build_bucket(age, state)
+        return bucket
+
+    def next_boundary(self, age):
+        # First age after `age` where the eligible events or a milestone change
+        i = bisect_right(self._boundaries, age)
+        return self._boundaries[i] if i < len(self._boundaries) else None
+
+    def _build_bucket(self, age, state):
+        # Every age in a band sees the same windows, so any age in it will do
+        eligible = [
+            event_type for event_type in self.events.values()
+            if event_type.at_age is None
+            and event_type.min_age <= age
+            and (event_type.max_age is None or age <= event_type.max_age)
+            and (event_type.eligible is None or event_type.eligible(state))
+        ]
+        weights = [event_type.chance for event_type in eligible]
+        total = sum(weights)
+        if not total:
+            return Bucket(AliasTable([None], [1.0]), None, 0.0)
+        events = AliasTable(eligible, weights)
+        quiet = 1.0 - total
+        if quiet <= 0:
+            return Bucket(events, events, 1.0)
+        return Bucket(AliasTable(eligible + [None], weights + [quiet]), events, total)
+
+    def fire(self, game, rng, force=False):
+        # With force=True the caller already knows an event happens this year
+        # (see LifeSimulator.skip_quiet_years) and it is drawn conditionally.
+        age = game.player.age
+        event_type = self.milestones.get(age)
+        if event_type is None:
+            bucket = self.bucket(age, life_state(game.player))
+            table = bucket.events if force else bucket.any_event
+            if table is None:
+                return None
+            event_type = table.draw(rng)
+            if event_type is None:
+                return None
+        event_type.build(game)
+        return event_type.name
+
+    def dispatch(self, game, choice):
+        handler = self.actions.get(choice['action'])
+        if handler is None:
+            game.current_event = None
+            return
+        handler(game, choice)
+
+
+registry = EventRegistry()
+event = registry.event
+action = registry.action
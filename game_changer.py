@@ -1,5 +1,14 @@
+import math
 import random
+import secrets
+import sys
 from enum import Enum
+import journal
+import metrics
+import pool
+import rules
+import world
+from events import registry, event, action, life_state, SINGLE, DATING, MARRIED
 from datetime import datetime
 
 # Enums
@@ -45,34 +54,109 @@ class Religion(Enum):
     def __str__(self):
         return self.value
 
+RULES = rules.load(SocioEconomicClass, EducationLevel, Nationality, Religion)
+WORLD_TABLES = world.Tables(RULES)
+POOL = pool.CandidatePool(RULES)
+
+# Fields tracked for delta persistence. A Person keeps one bit per field
+# assigned a different value since it was last saved, and LifeSimulator records
+# assignments. Relatives are not fields: they are links in the game's Dynasty.
+PERSON_FIELDS = (
+    'first_name', 'last_name', 'gender', 'birth_year', 'age', 'is_alive', 'health', 'happiness',
+    'intelligence', 'charisma', 'wealth', 'education', 'job', 'salary',
+    'family_wealth', 'family_education', 'nationality', 'religion', 'is_married'
+)
+FIELD_BITS = {name: 1 << i for i, name in enumerate(PERSON_FIELDS)}
+ALL_FIELDS = (1 << len(PERSON_FIELDS)) - 1
+GAME_FIELDS = frozenset([
+    'current_year', 'player', 'family', 'generation', 'game_speed', 'paused', 'current_event',
+    'notifications', 'achievements', 'game_active', 'family_assets', 'next_gen_name',
+    'career', 'rng_epoch', 'state_version'
+])
+# State keys of game fields that are not stored under their own name
+FIELD_KEYS = {'player': 'player_id'}
+
 # Person class
 class Person:
+    # Slotted to keep long dynasties and batch runs compact; names are interned.
+    # id and family are set when the person joins a Dynasty, and family is the
+    # Dynasty allowed to change the person (see Dynasty.own()).
+    __slots__ = PERSON_FIELDS + ('_changed', 'id', 'family')
+
     def __init__(self, first_name, last_name, gender, birth_year, family_wealth=50000, family_education=EducationLevel.HIGH_SCHOOL, nationality=Nationality.AMERICAN, religion=Religion.NONE, health=80, intelligence=60):
-        self.first_name = first_name
-        self.last_name = last_name
-        self.gender = gender
-        self.birth_year = birth_year
-        self.age = 0
-        self.is_alive = True
-        self.health = health
-        self.happiness = 50
-        self.intelligence = intelligence
-        self.charisma = 50
-        self.wealth = family_wealth * 0.2
-        self.education = None
-        self.job = None
-        self.salary = 0
-        self.spouse = None
-        self.children = []
-        self.family_wealth = family_wealth
-        self.family_education = family_education
-        self.nationality = nationality
-        self.religion = religion
-        self.is_married = False  # Track marriage status
+        # A new person is changed in every field
+        self._fill((
+            sys.intern(first_name), sys.intern(last_name), sys.intern(gender), birth_year,
+            0, True, health, 50,                            # age, is_alive, health, happiness
+            intelligence, 50, family_wealth * 0.2, None,    # intelligence, charisma, wealth, education
+            None, 0, family_wealth, family_education,       # job, salary, family_wealth, family_education
+            nationality, religion, False                    # nationality, religion, is_married
+        ), ALL_FIELDS)
+
+    def _fill(self, values, changed):
+        # Sets PERSON_FIELDS (in order) through their slots, past __setattr__
+        for set_field, value in zip(FIELD_SETTERS, values):
+            set_field(self, value)
+        self._changed = changed  # Bits of FIELD_BITS changed since the last save
+        self.id = None
+        self.family = None
 
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
+    def __setattr__(self, name, value):
+        # Only the first differing write to a field since the last save has
+        # to look at the old value
+        bit = FIELD_BITS.get(name)
+        if bit is not None and not self._changed & bit:
+            old = getattr(self, name)
+            if old is not value and old != value:
+                object.__setattr__(self, '_changed', self._changed | bit)
+        object.__setattr__(self, name, value)
+
+    def copy(self):
+        clone = object.__new__(Person)
+        for name in Person.__slots__:
+            object.__setattr__(clone, name, getattr(self, name))
+        return clone
+
+    @property
+    def spouse(self):
+        return self.family.spouse(self) if self.family else None
+
+    @spouse.setter
+    def spouse(self, partner):
+        self.family.set_spouse(self, partner)
+
+    @property
+    def children(self):
+        return self.family.children(self) if self.family else ()
+
+    def add_child(self, child):
+        self.family.add_child(self, child)
+
+    def dirty_fields(self):
+        changed = self._changed
+        return {name for name, bit in FIELD_BITS.items() if changed & bit}
+
+    def is_dirty(self):
+        return bool(self._changed)
+
+    def clear_dirty(self):
+        self._changed = 0
+
+    def serialize_field(self, name):
+        value = getattr(self, name)
+        if name == 'education':
+            return str(value) if value else None
+        if name in ('family_education', 'nationality', 'religion'):
+            return str(value)
+        return value
+
+    def to_delta(self):
+        # Changed fields since the last clear_dirty()
+        return {name: self.serialize_field(name) for name in self.dirty_fields()}
+
     def to_dict(self):
         return {
             'first_name': self.first_name,
@@ -89,8 +173,6 @@ class Person:
             'education': str(self.education) if self.education else None,
             'job': self.job,
             'salary': self.salary,
-            'spouse': self.spouse.to_dict() if self.spouse else None,
-            'children': [child.to_dict() for child in self.children],
             'family_wealth': self.family_wealth,
             'family_education': str(self.family_education),
             'nationality': str(self.nationality),
@@ -100,39 +182,263 @@ class Person:
 
     @classmethod
     def from_dict(cls, data):
-        nationality_map = {str(n): n for n in Nationality}
-        religion_map = {str(r): r for r in Religion}
-        person = cls(
-            first_name=data['first_name'],
-            last_name=data['last_name'],
-            gender=data['gender'],
-            birth_year=data['birth_year'],
-            family_wealth=data['family_wealth'],
-            family_education=EducationLevel[data['family_education']] if data['family_education'] else EducationLevel.HIGH_SCHOOL,
-            nationality=nationality_map.get(data.get('nationality', 'American'), Nationality.AMERICAN),
-            religion=religion_map.get(data.get('religion', 'None'), Religion.NONE),
-            health=data.get('health', random.randint(50, 90)),
-            intelligence=data.get('intelligence', random.randint(40, 80))
-        )
-        person.age = data['age']
-        person.is_alive = data['is_alive']
-        person.happiness = data['happiness']
-        person.charisma = data['charisma']
-        person.wealth = data['wealth']
-        if data['education']:
-            person.education = EducationLevel[data['education']]
-        person.job = data['job']
-        person.salary = data['salary']
-        if data['spouse']:
-            person.spouse = cls.from_dict(data['spouse'])
-        person.children = [cls.from_dict(child) for child in data.get('children', [])]
-        person.is_married = data.get('is_married', False)
+        # Only the person's own fields, as saved; relatives are restored by the
+        # Dynasty. Fields missing from old saves take the constructor's
+        # defaults, so loading draws no random numbers.
+        person = cls.__new__(cls)
+        person._fill((
+            sys.intern(data['first_name']),
+            sys.intern(data['last_name']),
+            sys.intern(data['gender']),
+            data['birth_year'],
+            data['age'],
+            data['is_alive'],
+            data.get('health', 80),
+            data['happiness'],
+            data.get('intelligence', 60),
+            data['charisma'],
+            data['wealth'],
+            EducationLevel[data['education']] if data['education'] else None,
+            sys.intern(data['job']) if data['job'] else None,
+            data['salary'],
+            data['family_wealth'],
+            EducationLevel[data['family_education']] if data['family_education'] else EducationLevel.HIGH_SCHOOL,
+            RULES.nationality_by_name.get(data.get('nationality', 'American'), Nationality.AMERICAN),
+            RULES.religion_by_name.get(data.get('religion', 'None'), Religion.NONE),
+            data.get('is_married', False)
+        ), 0)
+        return person
+
+# Slot setters of PERSON_FIELDS, for Person._fill()
+FIELD_SETTERS = tuple(Person.__dict__[name].__set__ for name in PERSON_FIELDS)
+
+# Dynasty class
+class Dynasty:
+    # Flat registry of everyone in a game's family, across generations. People
+    # are indexed by integer id (their position in the registry) and related
+    # through adjacency arrays, so lookups are indexed and (de)serializing is
+    # one linear pass without recursion. Only parents are stored; children are
+    # rebuilt from them on load.
+    #
+    # Forked registries share their arrays and Person objects copy-on-write: a
+    # registry only changes people whose family is itself, and copies anyone
+    # else the first time they are looked up, so everything handed out can be
+    # written. While the people list is shared those copies are kept aside,
+    # and the list itself is only copied when read whole (self.people: saving,
+    # the world engine's load), which costs as much anyway. The link arrays are
+    # copied on the first change of a link.
+    def __init__(self):
+        self._people = []
+        self.spouse_ids = []   # id -> spouse's id or None
+        self.parent_ids = []   # id -> tuple of parents' ids
+        self.child_ids = []    # id -> tuple of children's ids
+        self._saved_size = 0   # People already in the last saved state
+        self._links_dirty = False
+        self._people_shared = False   # _people is another registry's too
+        self._links_shared = False    # So are the link arrays
+        self._copies = {}             # id -> person copied while _people is shared
+
+    def __len__(self):
+        return len(self._people)
+
+    def __getitem__(self, person_id):
+        return self.own(person_id)
+
+    @property
+    def people(self):
+        if self._people_shared:
+            self._people = list(self._people)
+            for person_id, person in self._copies.items():
+                self._people[person_id] = person
+            self._copies = {}
+            self._people_shared = False
+        return self._people
+
+    def own(self, person_id):
+        person = self._people[person_id]
+        if person.family is not self:
+            person = self._copies.get(person_id, person)
+            if person.family is not self:
+                person = person.copy()
+                person.family = self
+                if self._people_shared:
+                    self._copies[person_id] = person
+                else:
+                    self._people[person_id] = person
         return person
 
+    def fork(self):
+        # Two registries sharing this one's people and links, one for each
+        # side of a game fork; this one must not be changed afterwards
+        return self._share(), self._share()
+
+    def _share(self):
+        family = Dynasty.__new__(Dynasty)
+        family.__dict__.update(self.__dict__)
+        family._people_shared = family._links_shared = True
+        family._copies = dict(self._copies)
+        return family
+
+    def _unshare_links(self):
+        if self._links_shared:
+            self.spouse_ids = list(self.spouse_ids)
+            self.parent_ids = list(self.parent_ids)
+            self.child_ids = list(self.child_ids)
+            self._links_shared = False
+
+    def add(self, person, parents=()):
+        if person.family is self:
+            return person.id
+        people = self.people
+        self._unshare_links()
+        person.id = len(people)
+        person.family = self
+        people.append(person)
+        self.spouse_ids.append(None)
+        self.parent_ids.append(tuple(parents))
+        self.child_ids.append(())
+        for parent_id in parents:
+            self.child_ids[parent_id] += (person.id,)
+        if parents:
+            self._links_dirty = True
+        return person.id
+
+    def spouse(self, person):
+        spouse_id = self.spouse_ids[person.id]
+        return None if spouse_id is None else self.own(spouse_id)
+
+    def set_spouse(self, person, partner):
+        self._unshare_links()
+        old = self.spouse_ids[person.id]
+        if old is not None:
+            self.spouse_ids[old] = None
+        if partner is not None:
+            self.add(partner)
+            self.spouse_ids[partner.id] = person.id
+        self.spouse_ids[person.id] = None if partner is None else partner.id
+        self._links_dirty = True
+
+    def children(self, person):
+        return tuple(map(self.own, self.child_ids[person.id]))
+
+    def parents(self, person):
+        return tuple(map(self.own, self.parent_ids[person.id]))
+
+    def add_child(self, parent, child):
+        # The parent's current spouse, if any, is the other parent
+        spouse_id = self.spouse_ids[parent.id]
+        self.add(child, (parent.id,) if spouse_id is None else (parent.id, spouse_id))
+
+    def ancestors(self, person_id):
+        # Ids of all ancestors, nearest generation first
+        return self._walk(person_id, self.parent_ids)
+
+    def descendants(self, person_id):
+        # Ids of all descendants, nearest generation first
+        return self._walk(person_id, self.child_ids)
+
+    def _walk(self, person_id, links):
+        seen = {person_id}
+        found = []
+        frontier = [person_id]
+        while frontier:
+            step = []
+            for current in frontier:
+                for other in links[current]:
+                    if other not in seen:
+                        seen.add(other)
+                        step.append(other)
+            found.extend(step)
+            frontier = step
+        return found
+
+    def is_dirty(self):
+        people = self.people
+        return self._links_dirty or len(people) > self._saved_size or any(person.is_dirty() for person in people)
+
+    def clear_dirty(self):
+        # Shared people are only copied if they have unsaved changes
+        for person in self.people:
+            if person.family is self:
+                person.clear_dirty()
+            elif person.is_dirty():
+                self.own(person.id).clear_dirty()
+        self._saved_size = len(self.people)
+        self._links_dirty = False
+
+    def to_delta(self):
+        # Dotted paths relative to the family; new people are written whole
+        # and changed links as whole (flat) arrays
+        delta = {}
+        for person in self.people[:self._saved_size]:
+            for name, value in person.to_delta().items():
+                delta[f'people.{person.id}.{name}'] = value
+        for person in self.people[self._saved_size:]:
+            delta[f'people.{person.id}'] = person.to_dict()
+        if self._links_dirty or len(self.people) > self._saved_size:
+            delta['spouses'] = list(self.spouse_ids)
+            delta['parents'] = [list(parents) for parents in self.parent_ids]
+        return delta
+
+    def to_dict(self):
+        # People are keyed by their id as a string, as they read back from JSON
+        return {
+            'people': {str(person.id): person.to_dict() for person in self.people},
+            'spouses': list(self.spouse_ids),
+            'parents': [list(parents) for parents in self.parent_ids]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        family = cls()
+        people = data['people']
+        for person_id, parents in enumerate(data['parents']):
+            family.add(Person.from_dict(people[str(person_id)]), parents)
+        family.spouse_ids = list(data['spouses'])
+        family.clear_dirty()
+        return family
+
+    @classmethod
+    def from_tree(cls, data):
+        # Converts a player saved in the old nested format (spouse and
+        # children embedded in each person) without recursing
+        family = cls()
+        root = Person.from_dict(data)
+        family.add(root)
+        pending = [(root, data)]
+        while pending:
+            person, node = pending.pop()
+            if node.get('spouse'):
+                spouse = Person.from_dict(node['spouse'])
+                family.set_spouse(person, spouse)
+                pending.append((spouse, node['spouse']))
+            for child_data in node.get('children', ()):
+                child = Person.from_dict(child_data)
+                family.add_child(person, child)
+                pending.append((child, child_data))
+        family.clear_dirty()
+        return family, root
+
 # LifeSimulator class
 class LifeSimulator:
-    def __init__(self):
-        self.current_year = datetime.now().year - random.randint(0, 30)
+    def __init__(self, seed=None):
+        object.__setattr__(self, '_dirty', set())
+        # Deltas written since the last full snapshot; None until first saved
+        self.deltas_since_snapshot = None
+        # Every notification added since load, unlike the capped notifications list
+        self.new_notifications = []
+        # Optional journal.Journal recording the game's history (transient)
+        self.journal = None
+        # world.World ticking the rest of the family, built on first use (transient)
+        self.world = None
+        # All of the game's randomness comes from self.rng. Each step (update,
+        # fast_forward, handle_choice) reseeds it from (seed, epoch), so a saved
+        # game replays identically without persisting the generator state.
+        self.rng_seed = secrets.randbits(64) if seed is None else seed
+        self.seed_stream(0)
+        self.current_year = datetime.now().year - self.rng.randint(0, 30)
+        # Everyone in the family across generations; player is one of them
+        self.family = Dynasty()
         self.player = None
         self.game_active = True
         self.generation = 1
@@ -143,44 +449,74 @@ class LifeSimulator:
         self.achievements = []
         self.family_assets = 0
         self.next_gen_name = None
+        # Last job the player held, kept once they retire or are fired
+        self.career = None
+        # Bumped by session_store.save_game() whenever the saved state changes
+        self.state_version = 0
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in GAME_FIELDS:
+            self._dirty.add(name)
+
+    def seed_stream(self, epoch):
+        self.rng_epoch = epoch
+        self.rng = random.Random(f"{self.rng_seed}:{epoch}")
+
+    def next_stream(self):
+        self.seed_stream(self.rng_epoch + 1)
+
+    def mark_dirty(self, name):
+        self._dirty.add(name)
+
+    def is_dirty(self):
+        self.sync_world()
+        return bool(self._dirty) or self.family.is_dirty()
+
+    def clear_dirty(self):
+        self.sync_world()
+        if self.journal:
+            self.journal.sync(self)
+        self._dirty.clear()
+        self.family.clear_dirty()
+
+    def to_delta(self):
+        # Dotted paths of the fields changed since the last clear_dirty(), for
+        # session_store.apply_delta(); a replaced family is written whole.
+        self.sync_world()
+        delta = {FIELD_KEYS.get(name, name): self.serialize_field(name) for name in self._dirty}
+        if 'family' not in self._dirty:
+            for path, value in self.family.to_delta().items():
+                delta[f'family.{path}'] = value
+        return delta
+
+    def serialize_field(self, name):
+        if name == 'player':
+            return self.player.id if self.player else None
+        if name == 'family':
+            return self.family.to_dict()
+        return getattr(self, name)
 
     def get_currency(self):
-        currency_map = {
-            Nationality.AMERICAN: ("USD", "$"),
-            Nationality.BRITISH: ("GBP", "£"),
-            Nationality.CHINESE: ("CNY", "¥"),
-            Nationality.INDIAN: ("INR", "₹"),
-            Nationality.BRAZILIAN: ("BRL", "R$"),
-            Nationality.NIGERIAN: ("NGN", "₦"),
-            Nationality.JAPANESE: ("JPY", "¥"),
-            Nationality.GERMAN: ("EUR", "€")
-        }
-        return currency_map[self.player.nationality] if self.player else ("USD", "$")
+        return RULES.currency[self.player.nationality] if self.player else RULES.default_currency
 
     def create_character(self, first_name, last_name, gender, socio_class=SocioEconomicClass.MIDDLE, nationality=Nationality.AMERICAN, religion=Religion.NONE):
-        wealth_map = {
-            SocioEconomicClass.POOR: random.randint(0, 20000),
-            SocioEconomicClass.MIDDLE: random.randint(30000, 80000),
-            SocioEconomicClass.WEALTHY: random.randint(100000, 500000)
-        }
-        education_map = {
-            SocioEconomicClass.POOR: EducationLevel.NONE,
-            SocioEconomicClass.MIDDLE: EducationLevel.HIGH_SCHOOL,
-            SocioEconomicClass.WEALTHY: random.choice([EducationLevel.HIGH_SCHOOL, EducationLevel.COLLEGE])
-        }
-        self.family_assets = wealth_map[socio_class]
+        class_rules = RULES.classes[socio_class]
+        self.family_assets = self.rng.randint(*class_rules.starting_wealth)
         self.player = Person(
             first_name=first_name,
             last_name=last_name,
             gender=gender,
             birth_year=self.current_year,
             family_wealth=self.family_assets,
-            family_education=education_map[socio_class],
+            family_education=self.rng.choice(class_rules.education),
             nationality=nationality,
             religion=religion,
-            health=random.randint(50, 90),
-            intelligence=random.randint(40, 80)
+            health=self.rng.randint(50, 90),
+            intelligence=self.rng.randint(40, 80)
         )
+        self.family.add(self.player)
+        self.career = None
         self.add_notification(f"A new baby named {self.player.full_name()} is born!")
         self.current_event = {
             'title': "New Life Begins",
@@ -189,15 +525,12 @@ class LifeSimulator:
                 {'text': "Begin Life Journey", 'action': 'start_life'}
             ]
         }
+        if self.journal:
+            self.journal.start_life(self)
 
     def generate_birth_description(self):
         if not self.player:
             return "No character created"
-        class_desc = {
-            SocioEconomicClass.POOR: "A struggling family with limited resources",
-            SocioEconomicClass.MIDDLE: "A stable middle-class family",
-            SocioEconomicClass.WEALTHY: "An affluent family with many opportunities"
-        }
         socio_class = self.determine_socio_class()
         currency_code, currency_symbol = self.get_currency()
         return "\n".join([
@@ -207,153 +540,294 @@ class LifeSimulator:
             f"Religion: {self.player.religion}",
             "",
             "Family Background:",
-            f"- {class_desc[socio_class]}",
+            f"- {RULES.classes[socio_class].description}",
             f"- Family wealth: {currency_symbol}{self.player.family_wealth:,} {currency_code}"
         ])
 
     def determine_socio_class(self):
-        if self.player.family_wealth < 20000:
-            return SocioEconomicClass.POOR
-        elif self.player.family_wealth < 100000:
-            return SocioEconomicClass.MIDDLE
-        else:
-            return SocioEconomicClass.WEALTHY
+        for socio_class, max_family_wealth in RULES.class_thresholds:
+            if max_family_wealth is None or self.player.family_wealth < max_family_wealth:
+                return socio_class
 
     def add_notification(self, message):
-        self.notifications.append(message)
-        if len(self.notifications) > 10:
-            self.notifications = self.notifications[-10:]
+        # notifications is replaced rather than appended to, since forks share it
+        self.new_notifications.append(message)
+        self.notifications = (self.notifications + [message])[-10:]
+
+    def can_advance(self):
+        # A year can be simulated: the game runs and no choice is waiting
+        return self.game_active and not self.paused and self.player is not None and not self.current_event
 
     def update(self):
+        # Reseeds only when a year is simulated, so a request that cannot
+        # advance leaves the game (and its saved state) untouched
+        if self.can_advance():
+            self.next_stream()
+            self.advance_year()
+
+    def advance_year(self, force_event=False):
         if not self.game_active or self.paused or not self.player:
             return
         self.current_year += 1
         self.player.age += 1
-        self.update_stats()
-        if not self.check_death():
-            self.process_year_events()
+        with metrics.PHASE_SECONDS.time(phase='update_stats'):
+            self.update_stats()
+        with metrics.PHASE_SECONDS.time(phase='world'):
+            self.tick_world()
+        with metrics.PHASE_SECONDS.time(phase='check_death'):
+            died = self.check_death()
+        if not died:
+            with metrics.PHASE_SECONDS.time(phase='year_events'):
+                self.process_year_events(force_event)
+        if self.journal:
+            self.journal.record(self, journal.YEAR)
+
+    def fast_forward(self, years=None):
+        # Advance up to `years` (default game_speed) years, stopping early when
+        # an event needs a choice or the player dies. Returns the notifications
+        # raised along the way.
+        if not self.can_advance():
+            return []
+        self.next_stream()
+        start = len(self.new_notifications)
+        remaining = years or self.game_speed
+        while remaining > 0 and self.can_advance():
+            skipped, event_due = self.skip_quiet_years(remaining)
+            remaining -= skipped
+            if remaining > 0:
+                self.advance_year(force_event=event_due)
+                remaining -= 1
+        return self.new_notifications[start:]
+
+    def skip_quiet_years(self, max_years):
+        # Jump over the years before the next event in one step. Within the
+        # quiet horizon the only changes are fixed yearly stat and wealth drift,
+        # so the number of quiet years is a geometric draw and the drift is
+        # applied in closed form. Returns (years skipped, whether the year after
+        # them is known to have an event).
+        horizon = min(max_years, self.quiet_horizon())
+        if horizon <= 0:
+            return 0, False
+        chance = registry.bucket(self.player.age + 1, life_state(self.player)).chance
+        if chance <= 0:
+            quiet = horizon
+        elif chance >= 1:
+            quiet = 0
+        else:
+            quiet = int(math.log(1.0 - self.rng.random()) / math.log(1.0 - chance))
+        years = min(quiet, horizon)
+        if years:
+            self.drift(years)
+            if self.journal:
+                self.journal.record(self, journal.DRIFT, years=years)
+        return years, quiet < horizon
+
+    def quiet_horizon(self):
+        # Number of coming years that are guaranteed to be plain drift: no
+        # milestone, no change of event bucket or aging band, no retirement and
+        # no chance of death.
+        player = self.player
+        age = player.age
+        # next_boundary() only looks past next year, whose milestone must fire
+        if age + 1 in registry.milestones:
+            return 0
+        drift = self.yearly_drift(age + 1)
+        if drift is None:
+            return 0
+        aging = RULES.aging
+        death = RULES.death
+        limits = [death['max_age'] - 1 - age]
+        for boundary in (registry.next_boundary(age + 1), aging['youth_until'], aging['decline_after'] + 1, aging['elderly_after'] + 1):
+            if boundary is not None and boundary > age + 1:
+                limits.append(boundary - 1 - age)
+        if player.job:
+            limits.append(RULES.retirement['age'] - 1 - age)
+        threshold = death['health_threshold']
+        if player.health < threshold:
+            limits.append(death['min_age'] - 1 - age)
+        elif drift['health'] < 0:
+            limits.append(int((player.health - threshold) / -drift['health']))
+        return max(0, min(limits))
+
+    def yearly_drift(self, age):
+        # Per-year stat changes update_stats() applies at `age`, or None when a
+        # stat is pushed both ways (its clamping would not be closed-form)
+        class_rules = RULES.classes[self.determine_socio_class()]
+        aging = RULES.aging
+        parts = {'health': [], 'intelligence': [], 'charisma': []}
+        if age < aging['youth_until']:
+            youth = aging['youth']
+            parts['intelligence'].append(youth['intelligence'])
+            parts['health'].append(youth['health'] + class_rules.health_mod)
+            parts['charisma'].append(youth['charisma'])
+        elif age > aging['decline_after']:
+            parts['health'].append(-aging['decline'] - class_rules.health_mod)
+            if age > aging['elderly_after']:
+                parts['health'].append(-aging['elderly'] - class_rules.health_mod)
+        if self.player.job:
+            for stat, amount in RULES.job_effects.get(self.player.job, ()):
+                parts[stat].append(amount)
+        drift = {}
+        for stat, amounts in parts.items():
+            if any(a > 0 for a in amounts) and any(a < 0 for a in amounts):
+                return None
+            drift[stat] = sum(amounts)
+        return drift
+
+    def drift(self, years):
+        # Closed form of `years` quiet update_stats() calls. Each stat moves in
+        # one direction, so clamping the total equals clamping every year.
+        drift = self.yearly_drift(self.player.age + 1)
+        for stat, amount in drift.items():
+            if amount:
+                setattr(self.player, stat, min(100, max(0, getattr(self.player, stat) + amount * years)))
+        if self.player.job:
+            monthly = self.player.salary / 12
+            self.player.wealth += monthly * RULES.classes[self.determine_socio_class()].wealth_mod * years
+            self.family_assets += monthly * 0.1 * years
+        self.player.age += years
+        self.current_year += years
+        # Deaths in the family during the skip change the player's event
+        # bucket only from the next simulated year
+        self.tick_world(years)
 
     def update_stats(self):
         if not self.player:
             return
-        socio_class = self.determine_socio_class()
-        health_mod = {'POOR': -0.5, 'MIDDLE': 0, 'WEALTHY': 0.5}
-        wealth_mod = {'POOR': 0.8, 'MIDDLE': 1.0, 'WEALTHY': 1.2}
-
-        if self.player.age < 20:
-            self.player.intelligence = min(100, self.player.intelligence + 0.5)
-            self.player.health = min(100, self.player.health + 0.2 + health_mod[socio_class.name])
-            self.player.charisma = min(100, self.player.charisma + 0.3)
-        elif self.player.age > 40:
-            self.player.health = max(0, self.player.health - 0.5 - health_mod[socio_class.name])
-            if self.player.age > 60:
-                self.player.health = max(0, self.player.health - 1 - health_mod[socio_class.name])
-
-        # Retirement at 60
-        if self.player.age >= 60 and self.player.job:
+        class_rules = RULES.classes[self.determine_socio_class()]
+        aging = RULES.aging
+        retirement = RULES.retirement
+
+        if self.player.age < aging['youth_until']:
+            youth = aging['youth']
+            self.player.intelligence = min(100, self.player.intelligence + youth['intelligence'])
+            self.player.health = min(100, self.player.health + youth['health'] + class_rules.health_mod)
+            self.player.charisma = min(100, self.player.charisma + youth['charisma'])
+        elif self.player.age > aging['decline_after']:
+            self.player.health = max(0, self.player.health - aging['decline'] - class_rules.health_mod)
+            if self.player.age > aging['elderly_after']:
+                self.player.health = max(0, self.player.health - aging['elderly'] - class_rules.health_mod)
+
+        # Retirement
+        if self.player.age >= retirement['age'] and self.player.job:
             self.add_notification(f"{self.player.first_name} has retired from {self.player.job}.")
+            self.career = self.player.job
             self.player.job = None
             self.player.salary = 0
             # Optional pension: small income based on wealth
             if self.player.wealth > 0:
-                self.player.wealth += min(self.player.wealth * 0.02, 1000)  # Up to 1000/month pension
+                self.player.wealth += min(self.player.wealth * retirement['pension_rate'], retirement['pension_cap'])
 
         if self.player.job:
-            self.player.wealth += (self.player.salary / 12) * wealth_mod[socio_class.name]
+            self.player.wealth += (self.player.salary / 12) * class_rules.wealth_mod
             self.family_assets += (self.player.salary / 12) * 0.1
-            if self.player.job == "Athlete":
-                self.player.health = min(100, self.player.health + 0.5)
-            elif self.player.job == "Actor":
-                self.player.charisma = min(100, self.player.charisma + 0.3)
-            elif self.player.job == "Politician":
-                self.player.intelligence = min(100, self.player.intelligence + 0.2)
-                self.player.charisma = min(100, self.player.charisma + 0.2)
+            for stat, amount in RULES.job_effects.get(self.player.job, ()):
+                setattr(self.player, stat, min(100, getattr(self.player, stat) + amount))
+
+    def tick_world(self, years=1):
+        # Ages everyone else in the family by `years` in batched passes, with
+        # quiet runs in closed form
+        if self.world is None or not self.world.current(self.family, self.player):
+            self.sync_world()
+            self.world = world.World(WORLD_TABLES, self.family, self.player)
+        for person_id in self.world.advance(self.rng, years):
+            self.relative_died(self.family[person_id])
+
+    def sync_world(self):
+        if self.world is not None:
+            self.world.flush()
+
+    def relative_died(self, person):
+        if person is self.player.spouse:
+            self.family.set_spouse(self.player, None)
+            self.player.is_married = False
+            # A pending proposal or family plan with them is void
+            if self.current_event and any(c['action'] in ('marry', 'have_child') for c in self.current_event['choices']):
+                self.current_event = None
+            self.add_notification(f"{self.player.first_name}'s partner {person.full_name()} died at age {person.age}.")
+        elif person in self.player.children:
+            self.add_notification(f"{self.player.first_name}'s child {person.first_name} died at age {person.age}.")
+        else:
+            self.add_notification(f"{person.full_name()} died at age {person.age}.")
+
+    def heirs(self):
+        return [child for child in self.player.children if child.is_alive]
 
     def check_death(self):
         if not self.player:
             return False
-        # Death guaranteed at age 100
-        if self.player.age >= 100:
+        death = RULES.death
+        # Death guaranteed at max age
+        if self.player.age >= death['max_age']:
             self.player.is_alive = False
             self.handle_death()
             return True
-        # Death possible if health < 20 and age >= 20
-        if self.player.health < 20 and self.player.age >= 20:
-            death_chance = (20 - self.player.health) * 0.01 + (self.player.age - 20) * 0.005
-            socio_mod = {'POOR': 1.2, 'MIDDLE': 1.0, 'WEALTHY': 0.8}[self.determine_socio_class().name]
-            if random.random() < death_chance * socio_mod:
+        # Death possible once health drops below the threshold
+        if self.player.health < death['health_threshold'] and self.player.age >= death['min_age']:
+            death_chance = (death['health_threshold'] - self.player.health) * death['health_factor'] + (self.player.age - death['min_age']) * death['age_factor']
+            socio_mod = RULES.classes[self.determine_socio_class()].death_mod
+            if self.rng.random() < death_chance * socio_mod:
                 self.player.is_alive = False
                 self.handle_death()
                 return True
         return False
 
-    def process_year_events(self):
+    def process_year_events(self, force=False):
         if not self.player:
             return
-        age = self.player.age
-        if age == 1:
-            self.add_notification(f"{self.player.first_name} takes first steps!")
-        elif age == 5:
-            self.add_notification(f"{self.player.first_name} starts kindergarten!")
-        elif age == 18:
-            self.coming_of_age_event()
-        elif age >= 20 and age <= 50 and random.random() < 0.1 and not self.player.spouse:
-            self.relationship_event()
-        elif age >= 20 and age <= 50 and random.random() < 0.1 and self.player.spouse and not self.player.is_married:
-            self.marriage_event()
-        elif age >= 22 and age <= 45 and random.random() < 0.05 and self.player.is_married:
-            if self.player.gender == "Female" and self.player.spouse.gender == "Male":
-                self.pregnancy_event()
-            else:
-                self.child_event()
-        elif age >= 20 and age < 60 and random.random() < 0.1 and not self.player.job:
-            self.job_event()
-        elif age >= 25 and age < 60 and random.random() < 0.05:
-            self.adoption_event()
-        elif age >= 18 and random.random() < 0.03:
-            self.gender_reassignment_event()
-        elif age >= 25 and random.random() < 0.04:
-            self.nationality_change_event()
-        elif age >= 20 and random.random() < 0.04:
-            self.religion_change_event()
-        elif age >= 30 and age < 60 and random.random() < 0.06 and self.player.job:
-            self.career_change_event()
+        name = registry.fire(self, self.rng, force)
+        if name:
+            metrics.EVENTS_TOTAL.inc(event=name)
+
+    @event('first_steps', at_age=1)
+    def first_steps_event(self):
+        self.add_notification(f"{self.player.first_name} takes first steps!")
+
+    @event('kindergarten', at_age=5)
+    def kindergarten_event(self):
+        self.add_notification(f"{self.player.first_name} starts kindergarten!")
 
+    @event('coming_of_age', at_age=18)
     def coming_of_age_event(self):
         currency_code, currency_symbol = self.get_currency()
-        options = [
-            {'text': f"Work as Waiter ({currency_symbol}500/month)", 'action': 'job_waiter'},
-            {'text': f"Work as Gardener ({currency_symbol}600/month)", 'action': 'job_gardener'},
-            {'text': f"Work as Maid ({currency_symbol}550/month)", 'action': 'job_maid'},
-            {'text': f"Work as Cashier ({currency_symbol}700/month)", 'action': 'job_cashier'}
-        ]
+        options = [self.job_choice(job, currency_symbol) for job in RULES.starter_jobs.values()]
         socio_class = self.determine_socio_class()
-        if (self.player.intelligence >= 60 or self.player.wealth >= 20000) and socio_class != SocioEconomicClass.POOR and self.player.wealth >= 20000:
-            options.append({'text': f"Go to College (-{currency_symbol}20,000)", 'action': 'college'})
-        if self.player.wealth >= 10000 and socio_class == SocioEconomicClass.WEALTHY:
-            options.append({'text': f"Travel the World (-{currency_symbol}10,000)", 'action': 'travel'})
+        college_cost = RULES.costs['college']
+        travel_cost = RULES.costs['travel']
+        if (self.player.intelligence >= 60 or self.player.wealth >= college_cost) and socio_class != SocioEconomicClass.POOR and self.player.wealth >= college_cost:
+            options.append({'text': f"Go to College (-{currency_symbol}{college_cost:,})", 'action': 'college'})
+        if self.player.wealth >= travel_cost and socio_class == SocioEconomicClass.WEALTHY:
+            options.append({'text': f"Travel the World (-{currency_symbol}{travel_cost:,})", 'action': 'travel'})
         self.current_event = {
             'title': "Coming of Age",
             'description': f"{self.player.first_name} is now 18. What path will they choose?",
             'choices': options
         }
 
+    @event('relationship', rules=RULES.events['relationship'], eligible=lambda state: state.relationship == SINGLE)
     def relationship_event(self):
-        partner = self.generate_person(age=self.player.age + random.randint(-5, 5))
-        compatibility = random.randint(30, 90)
+        index = self.match(self.player.age - 5, self.player.age + 5)
+        seed = self.candidate_seed()
+        partner = self.candidate(index, seed)
+        compatibility = self.rng.randint(30, 90)
         self.current_event = {
             'title': "Relationship Opportunity",
             'description': (
-                f"{self.player.first_name} meets {partner.full_name()} at a {random.choice(['party', 'work', 'school'])}.\n"
-                f"Shared interests: {random.choice(['music', 'art', 'sports'])}\n"
+                f"{self.player.first_name} meets {partner.full_name()} at a {self.rng.choice(['party', 'work', 'school'])}.\n"
+                f"Shared interests: {self.rng.choice(['music', 'art', 'sports'])}\n"
                 f"Initial attraction: {compatibility}%"
             ),
             'choices': [
                 {'text': f"Date {partner.first_name} ({compatibility}% match)", 'action': 'date'},
                 {'text': "Remain single", 'action': 'single'}
-            ]
+            ],
+            # Pool row and seed of the partner, so dating them gives this
+            # same person
+            'partner': index,
+            'partner_seed': seed
         }
 
+    @event('marriage', rules=RULES.events['marriage'], eligible=lambda state: state.relationship == DATING)
     def marriage_event(self):
         self.current_event = {
             'title': "Marriage Proposal",
@@ -364,54 +838,87 @@ class LifeSimulator:
             ]
         }
 
+    @event('family', rules=RULES.events['family'], eligible=lambda state: state.relationship == MARRIED)
+    def family_event(self):
+        if self.player.gender == "Female" and self.player.spouse.gender == "Male":
+            self.pregnancy_event()
+        else:
+            self.child_event()
+
+    def get_available_jobs(self):
+        socio_class = self.determine_socio_class()
+        jobs = RULES.classes[socio_class].jobs
+        bonus = [
+            bonus_job.job for bonus_job in RULES.bonus_jobs
+            if socio_class in bonus_job.classes and all(getattr(self.player, stat) >= minimum for stat, minimum in bonus_job.minimums)
+        ]
+        return jobs + tuple(bonus) if bonus else jobs
+
+    @event('job', rules=RULES.events['job'], eligible=lambda state: not state.employed)
+    def job_event(self):
+        available_jobs = self.get_available_jobs()
+        currency_code, currency_symbol = self.get_currency()
+        self.current_event = {
+            'title': "Job Opportunity",
+            'description': f"{self.player.first_name} has a chance to start working.",
+            'choices': [self.job_choice(job, currency_symbol) for job in available_jobs]
+        }
+
+    def job_choice(self, job, currency_symbol):
+        return {'text': f"Work as {job.name} ({currency_symbol}{job.salary}/month)", 'action': 'job', 'job': job.name, 'salary': job.salary}
+
     def pregnancy_event(self):
         currency_code, currency_symbol = self.get_currency()
         self.current_event = {
             'title': "Pregnancy Decision",
             'description': f"{self.player.first_name} is considering starting a family with {self.player.spouse.first_name}.",
             'choices': [
-                {'text': f"Try for a baby (-{currency_symbol}5,000)", 'action': 'have_child'},
+                {'text': f"Try for a baby (-{currency_symbol}{RULES.costs['have_child']:,})", 'action': 'have_child'},
                 {'text': "Wait for now", 'action': 'wait'}
             ]
         }
 
+    @event('adoption', rules=RULES.events['adoption'])
     def adoption_event(self):
         currency_code, currency_symbol = self.get_currency()
         self.current_event = {
             'title': "Adoption Opportunity",
             'description': f"{self.player.first_name} considers adopting a child.",
             'choices': [
-                {'text': f"Adopt a child (-{currency_symbol}15,000)", 'action': 'adopt'},
+                {'text': f"Adopt a child (-{currency_symbol}{RULES.costs['adopt']:,})", 'action': 'adopt'},
                 {'text': "Not now", 'action': 'decline'}
             ]
         }
 
+    @event('gender_reassignment', rules=RULES.events['gender_reassignment'])
     def gender_reassignment_event(self):
-        new_gender = random.choice(["Female" if self.player.gender == "Male" else "Male", "Non-Binary"])
+        new_gender = self.rng.choice(["Female" if self.player.gender == "Male" else "Male", "Non-Binary"])
         currency_code, currency_symbol = self.get_currency()
         self.current_event = {
             'title': "Gender Reassignment",
             'description': f"{self.player.first_name} is considering identifying as {new_gender}.",
             'choices': [
-                {'text': f"Proceed with reassignment (-{currency_symbol}10,000)", 'action': 'reassign'},
+                {'text': f"Proceed with reassignment (-{currency_symbol}{RULES.costs['reassign']:,})", 'action': 'reassign'},
                 {'text': "Stay as is", 'action': 'decline'}
             ]
         }
 
+    @event('nationality_change', rules=RULES.events['nationality_change'])
     def nationality_change_event(self):
-        new_nationality = random.choice([n for n in Nationality if n != self.player.nationality])
+        new_nationality = self.rng.choice([n for n in Nationality if n != self.player.nationality])
         currency_code, currency_symbol = self.get_currency()
         self.current_event = {
             'title': "Immigration Opportunity",
             'description': f"{self.player.first_name} has a chance to move and adopt {new_nationality} nationality.",
             'choices': [
-                {'text': f"Immigrate to become {new_nationality} (-{currency_symbol}25,000)", 'action': 'immigrate', 'nationality': str(new_nationality)},
+                {'text': f"Immigrate to become {new_nationality} (-{currency_symbol}{RULES.costs['immigrate']:,})", 'action': 'immigrate', 'nationality': str(new_nationality)},
                 {'text': "Stay in current country", 'action': 'decline'}
             ]
         }
 
+    @event('religion_change', rules=RULES.events['religion_change'])
     def religion_change_event(self):
-        new_religion = random.choice([r for r in Religion if r != self.player.religion])
+        new_religion = self.rng.choice([r for r in Religion if r != self.player.religion])
         self.current_event = {
             'title': "Spiritual Journey",
             'description': f"{self.player.first_name} is exploring {new_religion} and considering conversion.",
@@ -421,6 +928,7 @@ class LifeSimulator:
             ]
         }
 
+    @event('career_change', rules=RULES.events['career_change'], eligible=lambda state: state.employed)
     def career_change_event(self):
         if not self.player.job:
             return
@@ -436,65 +944,33 @@ class LifeSimulator:
             ]
         }
 
-    def get_available_jobs(self):
-        socio_class = self.determine_socio_class()
-        jobs = {
-            SocioEconomicClass.POOR: [
-                ("Cleaner", 800),
-                ("Laborer", 1000),
-                ("Cashier", 1200)
-            ],
-            SocioEconomicClass.MIDDLE: [
-                ("Teacher", 2000),
-                ("Nurse", 2500),
-                ("Salesperson", 3000)
-            ],
-            SocioEconomicClass.WEALTHY: [
-                ("Lawyer", 5000),
-                ("Doctor", 6000),
-                ("Entrepreneur", 8000)
-            ]
-        }
-        if self.player.charisma >= 70 and socio_class != SocioEconomicClass.POOR:
-            jobs[socio_class].append(("Actor", 10000))
-        if self.player.intelligence >= 80 and socio_class == SocioEconomicClass.WEALTHY:
-            jobs[socio_class].append(("Politician", 12000))
-        if self.player.health >= 70 and self.player.charisma >= 60:
-            jobs[socio_class].append(("Athlete", 9000))
-        return jobs[socio_class]
+    def generate_person(self, age=None):
+        # Someone of that age with the player's nationality and religion, or
+        # without an age an adult of 18-40 from anywhere
+        if age is None:
+            index = POOL.match(self.rng, self.rng.choice(RULES.nationalities), self.rng.choice(RULES.religions), 18, 40)
+        else:
+            index = self.match(age, age)
+        return self.candidate(index)
 
-    def job_event(self):
-        available_jobs = self.get_available_jobs()
-        currency_code, currency_symbol = self.get_currency()
-        self.current_event = {
-            'title': "Job Opportunity",
-            'description': f"{self.player.first_name} has a chance to start working.",
-            'choices': [
-                {'text': f"Work as {job} ({currency_symbol}{salary}/month)", 'action': f'job_{i}'}
-                for i, (job, salary) in enumerate(available_jobs)
-            ]
-        }
+    def match(self, min_age, max_age):
+        # Row of a pool candidate sharing the player's nationality and religion
+        return POOL.match(self.rng, self.player.nationality, self.player.religion, min_age, max_age)
 
-    def generate_person(self, age=None):
-        gender_options = ["Male", "Female", "Non-Binary"]
-        gender = random.choice(gender_options)
-        first_name = random.choice(["James", "John", "Mary", "Jennifer", "Alex", "Taylor"]) if not self.next_gen_name else self.next_gen_name
-        last_name = random.choice(["Smith", "Johnson", "Williams"])
-        nationality = random.choice(list(Nationality)) if not age else self.player.nationality
-        religion = random.choice(list(Religion)) if not age else self.player.religion
-        self.next_gen_name = None
-        return Person(
-            first_name=first_name,
-            last_name=last_name,
-            gender=gender,
-            birth_year=self.current_year - (age if age else random.randint(18, 40)),
+    def candidate_seed(self):
+        return self.rng.getrandbits(32)
+
+    def candidate(self, index, seed=None):
+        # The pool candidate of a row, new unless given the seed it was shown with
+        fields, age = POOL.row(index, self.candidate_seed() if seed is None else seed)
+        person = Person(
+            birth_year=self.current_year - age,
             family_wealth=self.family_assets * 0.5,
             family_education=self.player.family_education if self.player else EducationLevel.HIGH_SCHOOL,
-            nationality=nationality,
-            religion=religion,
-            health=random.randint(50, 90),
-            intelligence=random.randint(40, 80)
+            **fields
         )
+        person.age = age
+        return person
 
     def child_event(self):
         currency_code, currency_symbol = self.get_currency()
@@ -502,163 +978,190 @@ class LifeSimulator:
             'title': "Family Planning",
             'description': f"{self.player.first_name} and {self.player.spouse.first_name} consider having a child.",
             'choices': [
-                {'text': f"Have a baby (-{currency_symbol}5,000)", 'action': 'have_child'},
+                {'text': f"Have a baby (-{currency_symbol}{RULES.costs['have_child']:,})", 'action': 'have_child'},
                 {'text': "Wait for now", 'action': 'wait'}
             ]
         }
 
     def handle_choice(self, choice_index):
-        if not self.current_event or choice_index >= len(self.current_event['choices']):
+        if not self.current_event or not 0 <= choice_index < len(self.current_event['choices']):
             return
+        self.next_stream()
         choice = self.current_event['choices'][choice_index]
-        action = choice['action']
+        registry.dispatch(self, choice)
+        if self.journal and self.player:
+            self.journal.record(self, journal.CHOICE, action=choice['action'])
 
-        currency_code, currency_symbol = self.get_currency()
+    @action('start_life')
+    def start_life(self, choice):
+        self.paused = False
+        self.current_event = None
 
-        if action == 'start_life':
-            self.paused = False
-            self.current_event = None
-        elif action == 'college':
-            if self.player.wealth >= 20000:
-                self.player.education = EducationLevel.COLLEGE
-                self.player.wealth -= 20000
-                self.family_assets -= 20000
-                self.add_notification(f"{self.player.first_name} enrolled in college!")
-            else:
-                self.add_notification(f"{self.player.first_name} cannot afford college.")
-            self.current_event = None
-        elif action.startswith('job_'):
-            if action == 'job_waiter':
-                self.player.job = "Waiter"
-                self.player.salary = 500
-            elif action == 'job_gardener':
-                self.player.job = "Gardener"
-                self.player.salary = 600
-            elif action == 'job_maid':
-                self.player.job = "Maid"
-                self.player.salary = 550
-            elif action == 'job_cashier':
-                self.player.job = "Cashier"
-                self.player.salary = 700
-            else:
-                job_index = int(action.split('_')[1])
-                available_jobs = self.get_available_jobs()
-                self.player.job = available_jobs[job_index][0]
-                self.player.salary = available_jobs[job_index][1]
-            self.add_notification(f"{self.player.first_name} started working as {self.player.job}!")
-            self.current_event = None
-        elif action == 'have_child':
-            if self.player.wealth >= 5000:
-                child = self.generate_person(age=0)
-                self.player.children.append(child)
-                self.player.wealth -= 5000
-                self.family_assets -= 5000
-                self.add_notification(f"{self.player.first_name} and {self.player.spouse.first_name} had a baby named {child.first_name}!")
-            else:
-                self.add_notification(f"{self.player.first_name} cannot afford to have a child.")
-            self.current_event = None
-        elif action == 'adopt':
-            if self.player.wealth >= 15000:
-                child = self.generate_person(age=random.randint(0, 10))
-                self.player.children.append(child)
-                self.player.wealth -= 15000
-                self.family_assets -= 15000
-                self.add_notification(f"{self.player.first_name} adopted {child.full_name()}!")
-            else:
-                self.add_notification(f"{self.player.first_name} cannot afford to adopt.")
-            self.current_event = None
-        elif action == 'reassign':
-            if self.player.wealth >= 10000:
-                new_gender = self.current_event['description'].split('as ')[-1].strip('.')
-                self.player.gender = new_gender
-                self.player.wealth -= 10000
-                self.family_assets -= 10000
-                self.add_notification(f"{self.player.first_name} transitioned to {new_gender}!")
-            else:
-                self.add_notification(f"{self.player.first_name} cannot afford gender reassignment.")
-            self.current_event = None
-        elif action == 'immigrate':
-            if self.player.wealth >= 25000:
-                nationality_map = {str(n): n for n in Nationality}
-                self.player.nationality = nationality_map[choice.get('nationality')]
-                self.player.wealth -= 25000
-                self.family_assets -= 25000
-                self.add_notification(f"{self.player.first_name} immigrated and is now {self.player.nationality}!")
-            else:
-                self.add_notification(f"{self.player.first_name} cannot afford to immigrate.")
-            self.current_event = None
-        elif action == 'convert':
-            religion_map = {str(r): r for r in Religion}
-            self.player.religion = religion_map[choice.get('religion')]
-            self.add_notification(f"{self.player.first_name} converted to {self.player.religion}!")
-            self.current_event = None
-        elif action == 'date':
+    @action('college')
+    def go_to_college(self, choice):
+        cost = RULES.costs['college']
+        if self.player.wealth >= cost:
+            self.player.education = EducationLevel.COLLEGE
+            self.player.wealth -= cost
+            self.family_assets -= cost
+            self.add_notification(f"{self.player.first_name} enrolled in college!")
+        else:
+            self.add_notification(f"{self.player.first_name} cannot afford college.")
+        self.current_event = None
+
+    @action('job')
+    def take_job(self, choice):
+        self.player.job = choice['job']
+        self.player.salary = choice['salary']
+        self.add_notification(f"{self.player.first_name} started working as {self.player.job}!")
+        self.current_event = None
+
+    @action('have_child')
+    def have_child(self, choice):
+        cost = RULES.costs['have_child']
+        if self.player.wealth >= cost:
+            child = self.generate_person(age=0)
+            self.player.add_child(child)
+            self.player.wealth -= cost
+            self.family_assets -= cost
+            self.add_notification(f"{self.player.first_name} and {self.player.spouse.first_name} had a baby named {child.first_name}!")
+        else:
+            self.add_notification(f"{self.player.first_name} cannot afford to have a child.")
+        self.current_event = None
+
+    @action('adopt')
+    def adopt(self, choice):
+        cost = RULES.costs['adopt']
+        if self.player.wealth >= cost:
+            child = self.candidate(self.match(0, 10))
+            self.player.add_child(child)
+            self.player.wealth -= cost
+            self.family_assets -= cost
+            self.add_notification(f"{self.player.first_name} adopted {child.full_name()}!")
+        else:
+            self.add_notification(f"{self.player.first_name} cannot afford to adopt.")
+        self.current_event = None
+
+    @action('reassign')
+    def reassign_gender(self, choice):
+        cost = RULES.costs['reassign']
+        if self.player.wealth >= cost:
+            new_gender = self.current_event['description'].split('as ')[-1].strip('.')
+            self.player.gender = new_gender
+            self.player.wealth -= cost
+            self.family_assets -= cost
+            self.add_notification(f"{self.player.first_name} transitioned to {new_gender}!")
+        else:
+            self.add_notification(f"{self.player.first_name} cannot afford gender reassignment.")
+        self.current_event = None
+
+    @action('immigrate')
+    def immigrate(self, choice):
+        cost = RULES.costs['immigrate']
+        if self.player.wealth >= cost:
+            self.player.nationality = RULES.nationality_by_name[choice.get('nationality')]
+            self.player.wealth -= cost
+            self.family_assets -= cost
+            self.add_notification(f"{self.player.first_name} immigrated and is now {self.player.nationality}!")
+        else:
+            self.add_notification(f"{self.player.first_name} cannot afford to immigrate.")
+        self.current_event = None
+
+    @action('convert')
+    def convert(self, choice):
+        self.player.religion = RULES.religion_by_name[choice.get('religion')]
+        self.add_notification(f"{self.player.first_name} converted to {self.player.religion}!")
+        self.current_event = None
+
+    @action('date')
+    def date(self, choice):
+        event = self.current_event or {}
+        # Events saved before partners had a seed hold a row of an older pool
+        if 'partner_seed' in event:
+            partner = self.candidate(event['partner'], event['partner_seed'])
+        else:
             partner = self.generate_person(age=self.player.age)
-            self.player.spouse = partner
-            self.add_notification(f"{self.player.first_name} is now dating {partner.full_name()}!")
-            self.current_event = None
-        elif action == 'marry':
-            self.player.is_married = True
-            self.player.spouse.is_married = True
-            if self.player.gender == "Female" and self.player.spouse.gender == "Male":
-                self.player.last_name = self.player.spouse.last_name
-                self.add_notification(f"{self.player.first_name} married {self.player.spouse.full_name()} and took the last name {self.player.spouse.last_name}!")
-            elif self.player.spouse.gender == "Female" and self.player.gender == "Male":
-                self.player.spouse.last_name = self.player.last_name
-                self.add_notification(f"{self.player.spouse.first_name} married {self.player.full_name()} and took the last name {self.player.last_name}!")
-            else:
-                self.add_notification(f"{self.player.first_name} married {self.player.spouse.full_name()}!")
-            self.current_event = None
-        elif action == 'new_life':
-            self.__init__()
-            self.current_event = None
-            self.add_notification("Starting a new life...")
-        elif action == 'next_gen_prompt':
-            self.current_event = {
-                'title': "Name Your Child",
-                'description': "Choose a name for your next generation character.",
-                'choices': [
-                    {'text': "Enter name", 'action': 'next_gen_name'}
-                ]
-            }
-            return
-        elif action == 'next_gen_name':
-            self.next_gen_name = self.current_event.get('new_name', "Child")
-            if self.next_generation():
-                self.current_event = None
-        elif action == 'restart':
-            self.create_character(
-                first_name=random.choice(["James", "John", "Mary", "Jennifer", "Alex", "Taylor"]),
-                last_name=self.player.last_name,
-                gender=random.choice(["Male", "Female", "Non-Binary"]),
-                socio_class=self.determine_socio_class(),
-                nationality=self.player.nationality,
-                religion=self.player.religion
-            )
-            self.generation = 1
-            self.current_event = None
-            self.paused = False
-        elif action == 'promotion_risk':
-            success_chance = (self.player.intelligence + self.player.charisma) / 200
-            if random.random() < success_chance:
-                self.player.salary = int(self.player.salary * 1.5)
-                self.add_notification(f"{self.player.first_name} was promoted! New salary: {currency_symbol}{self.player.salary}/month")
-            else:
-                self.add_notification(f"{self.player.first_name}'s extra effort went unnoticed.")
-            self.current_event = None
-        elif action == 'firing_risk':
-            failure_chance = (100 - self.player.charisma) / 100
-            if random.random() < failure_chance:
-                self.add_notification(f"{self.player.first_name} was fired from {self.player.job}!")
-                self.player.job = None
-                self.player.salary = 0
-            else:
-                self.add_notification(f"{self.player.first_name} avoided trouble with the boss.")
-            self.current_event = None
+        self.player.spouse = partner
+        self.add_notification(f"{self.player.first_name} is now dating {partner.full_name()}!")
+        self.current_event = None
+
+    @action('marry')
+    def marry(self, choice):
+        self.player.is_married = True
+        self.player.spouse.is_married = True
+        if self.player.gender == "Female" and self.player.spouse.gender == "Male":
+            self.player.last_name = self.player.spouse.last_name
+            self.add_notification(f"{self.player.first_name} married {self.player.spouse.full_name()} and took the last name {self.player.spouse.last_name}!")
+        elif self.player.spouse.gender == "Female" and self.player.gender == "Male":
+            self.player.spouse.last_name = self.player.last_name
+            self.add_notification(f"{self.player.spouse.first_name} married {self.player.full_name()} and took the last name {self.player.last_name}!")
         else:
+            self.add_notification(f"{self.player.first_name} married {self.player.spouse.full_name()}!")
+        self.current_event = None
+
+    @action('new_life')
+    def new_life(self, choice):
+        history, version = self.journal, self.state_version
+        self.__init__(seed=self.rng.getrandbits(64))
+        self.journal, self.state_version = history, version
+        self.current_event = None
+        self.add_notification("Starting a new life...")
+
+    @action('next_gen_prompt')
+    def next_gen_prompt(self, choice):
+        self.current_event = {
+            'title': "Name Your Child",
+            'description': "Choose a name for your next generation character.",
+            'choices': [
+                {'text': "Enter name", 'action': 'next_gen_name'}
+            ]
+        }
+
+    @action('next_gen_name')
+    def name_next_gen(self, choice):
+        self.next_gen_name = self.current_event.get('new_name', "Child")
+        if self.next_generation():
             self.current_event = None
 
+    @action('restart')
+    def restart(self, choice):
+        self.create_character(
+            first_name=self.rng.choice(RULES.first_names),
+            last_name=self.player.last_name,
+            gender=self.rng.choice(RULES.genders),
+            socio_class=self.determine_socio_class(),
+            nationality=self.player.nationality,
+            religion=self.player.religion
+        )
+        self.generation = 1
+        self.current_event = None
+        self.paused = False
+
+    @action('promotion_risk')
+    def promotion_risk(self, choice):
+        currency_code, currency_symbol = self.get_currency()
+        success_chance = (self.player.intelligence + self.player.charisma) / 200
+        if self.rng.random() < success_chance:
+            self.player.salary = int(self.player.salary * 1.5)
+            self.add_notification(f"{self.player.first_name} was promoted! New salary: {currency_symbol}{self.player.salary}/month")
+        else:
+            self.add_notification(f"{self.player.first_name}'s extra effort went unnoticed.")
+        self.current_event = None
+
+    @action('firing_risk')
+    def firing_risk(self, choice):
+        failure_chance = (100 - self.player.charisma) / 100
+        if self.rng.random() < failure_chance:
+            self.add_notification(f"{self.player.first_name} was fired from {self.player.job}!")
+            self.career = self.player.job
+            self.player.job = None
+            self.player.salary = 0
+        else:
+            self.add_notification(f"{self.player.first_name} avoided trouble with the boss.")
+        self.current_event = None
+
     def handle_death(self):
+        metrics.DEATHS_TOTAL.inc(socio_class=str(self.determine_socio_class()))
         currency_code, currency_symbol = self.get_currency()
         summary = [
             f"{self.player.full_name()} has died at age {self.player.age}.",
@@ -672,13 +1175,13 @@ class LifeSimulator:
             summary.append(f"Spouse: {self.player.spouse.full_name()}")
         if self.player.children:
             summary.append(f"Children: {len(self.player.children)}")
-        if self.player.job:
-            summary.append(f"Career: {self.player.job}")
+        if self.player.job or self.career:
+            summary.append(f"Career: {self.player.job or self.career}")
         choices = [
             {'text': "Start New Life (New Family)", 'action': 'new_life'},
             {'text': "Restart with New Character (Same Family)", 'action': 'restart'}
         ]
-        if self.player.children:
+        if self.heirs():
             choices.insert(0, {'text': "Continue as a Child (Choose Name)", 'action': 'next_gen_prompt'})
         self.current_event = {
             'title': "Life Complete",
@@ -688,21 +1191,29 @@ class LifeSimulator:
         self.paused = True
 
     def next_generation(self):
-        if not self.player or not self.player.children:
+        # The heir takes over the life the world engine has been simulating,
+        # plus half the family assets
+        if not self.player or not self.heirs():
             return False
+        self.sync_world()
         self.generation += 1
-        self.player = random.choice(self.player.children)
-        self.player.age = self.current_year - self.player.birth_year
-        self.player.wealth = self.family_assets * 0.5
+        self.player = self.rng.choice(self.heirs())
+        self.career = None
+        if self.next_gen_name:
+            self.player.first_name = sys.intern(self.next_gen_name)
+            self.next_gen_name = None
+        self.player.wealth += self.family_assets * 0.5
         self.family_assets *= 0.5
         self.add_notification(f"Now playing as {self.player.full_name()} (Generation {self.generation})")
         self.paused = False
         return True
 
     def to_dict(self):
+        self.sync_world()
         return {
             'current_year': self.current_year,
-            'player': self.player.to_dict() if self.player else None,
+            'player_id': self.player.id if self.player else None,
+            'family': self.family.to_dict(),
             'generation': self.generation,
             'game_speed': self.game_speed,
             'paused': self.paused,
@@ -711,22 +1222,64 @@ class LifeSimulator:
             'achievements': self.achievements,
             'game_active': self.game_active,
             'family_assets': self.family_assets,
-            'next_gen_name': self.next_gen_name
+            'next_gen_name': self.next_gen_name,
+            'career': self.career,
+            'rng_seed': self.rng_seed,
+            'rng_epoch': self.rng_epoch,
+            'state_version': self.state_version
         }
 
     @classmethod
     def from_dict(cls, data):
-        game = cls()
+        game = cls(seed=data.get('rng_seed'))
+        game.seed_stream(data.get('rng_epoch', 0))
         game.current_year = data.get('current_year', datetime.now().year - 20)
         game.generation = data.get('generation', 1)
         game.game_speed = data.get('game_speed', 1)
         game.paused = data.get('paused', True)
-        game.notifications = data.get('notifications', [])
-        game.achievements = data.get('achievements', [])
+        game.notifications = list(data.get('notifications', []))
+        game.achievements = list(data.get('achievements', []))
         game.game_active = data.get('game_active', True)
         game.family_assets = data.get('family_assets', 0)
         game.next_gen_name = data.get('next_gen_name')
-        if data.get('player'):
-            game.player = Person.from_dict(data['player'])
+        game.career = data.get('career')
+        game.state_version = data.get('state_version', 0)
+        if 'family' in data:
+            game.family = Dynasty.from_dict(data['family'])
+            if data.get('player_id') is not None:
+                game.player = game.family[data['player_id']]
+        elif data.get('player'):
+            game.family, game.player = Dynasty.from_tree(data['player'])
         game.current_event = data.get('current_event')
+        game.clear_dirty()
         return game
+
+    def fork(self, seed=None):
+        # A what-if branch of the game as it stands, without copying it: the
+        # two games share the family, event and notifications, and each copies
+        # people only as it reaches them. The fork continues this game's
+        # random stream unless given a seed, and has no journal or saved
+        # history of its own.
+        self.sync_world()
+        child = object.__new__(LifeSimulator)
+        child.__dict__.update(self.__dict__)
+        object.__setattr__(child, '_dirty', set())
+        mine, theirs = self.family.fork()
+        # Same people as before, so not a change to save. This game keeps its
+        # player object; the fork copies the player on first reaching them.
+        object.__setattr__(self, 'family', mine)
+        object.__setattr__(child, 'family', theirs)
+        if self.player:
+            self.player.family = mine
+            object.__setattr__(child, 'player', theirs[self.player.id])
+        self.world = child.world = None
+        child.journal = None
+        child.deltas_since_snapshot = None
+        child.new_notifications = []
+        if seed is None:
+            child.rng = random.Random()
+            child.rng.setstate(self.rng.getstate())
+        else:
+            child.rng_seed = seed
+            child.seed_stream(0)
+        return child
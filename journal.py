@@ -0,0 +1,212 @@
+import json
+import mmap
+import os
+from session_store import apply_delta
+
+# Append-only journal of a game's history, one line per entry:
+#
+#     <kind> <life> <year> <json>
+#
+# A life starts with a snapshot (S) of the full game state; after that every
+# simulated year (Y), skipped run of quiet years (D), choice (C) and any other
+# saved change (U) is written as the game's pending delta plus the
+# notifications it raised, with another snapshot every SNAPSHOT_EVERY entries.
+# The state at the end of any journaled year is rebuilt by replaying from the
+# nearest earlier snapshot; years inside a skipped quiet run have no entry of
+# their own and read as the state before the skip. Readers mmap the file and only decode the entries
+# they replay; the short plain-text header is enough to find them.
+
+SNAPSHOT_EVERY = 50
+SNAPSHOT, YEAR, DRIFT, CHOICE, SYNC = 'S', 'Y', 'D', 'C', 'U'
+
+
+class Journal:
+    def __init__(self, path, snapshot_every=SNAPSHOT_EVERY, max_notifications=10):
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.max_notifications = max_notifications
+        self._pending = []
+        self._tail = None
+        self._last_delta = None
+        self._notes_seen = 0
+
+    # Writing
+
+    def start_life(self, game):
+        life, _ = self._tail_state()
+        self._tail = (life + 1, 0)
+        self._write(SNAPSHOT, game.current_year, {'state': game.to_dict()})
+        self._notes_seen = len(game.new_notifications)
+        self._last_delta = self._delta(game)
+
+    def record(self, game, kind, **info):
+        life, since_snapshot = self._tail_state()
+        if not life:
+            self.start_life(game)
+            return
+        info['delta'] = self._last_delta = self._delta(game)
+        info['notes'] = game.new_notifications[self._notes_seen:]
+        self._notes_seen = len(game.new_notifications)
+        self._write(kind, game.current_year, info)
+        if since_snapshot + 1 >= self.snapshot_every:
+            self._write(SNAPSHOT, game.current_year, {'state': game.to_dict()})
+            self._tail = (life, 0)
+        else:
+            self._tail = (life, since_snapshot + 1)
+
+    def sync(self, game):
+        # Called before the game's dirty state is cleared, to catch changes
+        # made outside the simulation (speed, pause, ...). A request that
+        # changed nothing writes nothing; a journal is opened per request, so
+        # the last delta is only known for entries recorded in this one.
+        delta = self._delta(game)
+        changed = delta and delta != self._last_delta
+        if (changed or len(game.new_notifications) > self._notes_seen) and self._tail_state()[0]:
+            self.record(game, SYNC)
+        self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'ab') as f:
+            f.write(b''.join(self._pending))
+        self._pending = []
+
+    def _delta(self, game):
+        # Notifications are journaled as the notes each entry raised; the
+        # session store's state_version is bookkeeping, not history
+        delta = game.to_delta()
+        delta.pop('notifications', None)
+        delta.pop('state_version', None)
+        return delta
+
+    def _write(self, kind, year, payload):
+        life = self._tail[0]
+        self._pending.append(f"{kind} {life} {year} {json.dumps(payload, separators=(',', ':'))}\n".encode('utf-8'))
+
+    def _tail_state(self):
+        # (current life, entries since its last snapshot), read from the end
+        # of the file the first time it is needed
+        if self._tail is None:
+            self._tail = (0, 0)
+            with self._map() as data:
+                if data is not None:
+                    since_snapshot = 0
+                    end = len(data)
+                    life = None
+                    while end > 0:
+                        start = data.rfind(b'\n', 0, end - 1) + 1
+                        kind, entry_life, _ = _header(data, start)
+                        if life is None:
+                            life = entry_life
+                        if kind == SNAPSHOT or entry_life != life:
+                            break
+                        since_snapshot += 1
+                        end = start
+                    self._tail = (life, since_snapshot)
+        return self._tail
+
+    # Reading
+
+    def _map(self):
+        return _Mapped(self.path)
+
+    def entries(self, life=None):
+        # (kind, life, year) of every entry, decoding only the headers
+        self.flush()
+        with self._map() as data:
+            if data is not None:
+                for kind, entry_life, year, _, _ in _scan(data, life):
+                    yield kind, entry_life, year
+
+    def lives(self):
+        return self._tail_state()[0]
+
+    def history(self, life=None):
+        # Decoded entries of one life (default: the latest), for auditing
+        life = life or self.lives()
+        self.flush()
+        with self._map() as data:
+            if data is not None:
+                for kind, _, year, start, end in _scan(data, life):
+                    yield kind, year, _payload(data, start, end)
+
+    def state_at(self, year, life=None):
+        # Game state (as from to_dict()) at the end of `year`, or None if the
+        # life had not started by then
+        life = life or self.lives()
+        self.flush()
+        with self._map() as data:
+            if data is None:
+                return None
+            snapshot = None
+            replay = []
+            for kind, _, entry_year, start, end in _scan(data, life):
+                if entry_year > year:
+                    break
+                if kind == SNAPSHOT:
+                    snapshot = (start, end)
+                    replay = []
+                else:
+                    replay.append((start, end))
+            if snapshot is None:
+                return None
+            state = _payload(data, *snapshot)['state']
+            for start, end in replay:
+                entry = _payload(data, start, end)
+                apply_delta(state, entry['delta'])
+                if entry['notes']:
+                    state['notifications'] = (state['notifications'] + entry['notes'])[-self.max_notifications:]
+            return state
+
+
+class _Mapped:
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.data = None
+
+    def __enter__(self):
+        try:
+            self.file = open(self.path, 'rb')
+        except FileNotFoundError:
+            return None
+        if os.fstat(self.file.fileno()).st_size == 0:
+            return None
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.data
+
+    def __exit__(self, *exc):
+        if self.data is not None:
+            self.data.close()
+        if self.file is not None:
+            self.file.close()
+        return False
+
+
+def _scan(data, life=None):
+    # (kind, life, year, start, end) of each line, end excluding the newline
+    pos = 0
+    size = len(data)
+    while pos < size:
+        end = data.find(b'\n', pos)
+        if end < 0:
+            end = size
+        kind, entry_life, year = _header(data, pos)
+        if life is None or entry_life == life:
+            yield kind, entry_life, year, pos, end
+        pos = end + 1
+
+
+def _header(data, start):
+    kind_end = data.find(b' ', start)
+    life_end = data.find(b' ', kind_end + 1)
+    year_end = data.find(b' ', life_end + 1)
+    return data[start:kind_end].decode(), int(data[kind_end + 1:life_end]), int(data[life_end + 1:year_end])
+
+
+def _payload(data, start, end):
+    return json.loads(data[data.find(b'{', start):end])
@@ -0,0 +1,92 @@
+import atexit
+import logging
+import os
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
+# Request threads only put log records on a queue; a background listener
+# formats them and does the I/O. Records are queued unformatted, so %-style
+# arguments are only rendered by the listener and only for records that pass
+# the level check and the sampler.
+#
+# Debug records can be sampled per route: LIFESIM_LOG_SAMPLE is a list like
+# "index=0.01,advance_year=0.1,*=1" of endpoint=rate pairs. The decision is made
+# once per request, so a sampled request keeps its whole trace. INFO and above
+# are never sampled.
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+_listener = None
+
+
+class LazyQueueHandler(QueueHandler):
+    def prepare(self, record):
+        # The stock handler formats here, on the caller's thread
+        return record
+
+
+class RouteSampler(logging.Filter):
+    def __init__(self, rates=None, default=1.0):
+        super().__init__()
+        self.rates = rates or {}
+        self.default = self.rates.get('*', default)
+
+    def filter(self, record):
+        if record.levelno >= logging.INFO:
+            return True
+        # Imported here so the pipeline also works outside Flask
+        from flask import g, has_request_context, request
+        if not has_request_context():
+            return True
+        sampled = g.get('log_sampled')
+        if sampled is None:
+            # Routes are named without their blueprint ("index", not
+            # "game.index"), though a full endpoint name also matches
+            endpoint = request.endpoint or ''
+            rate = self.rates.get(endpoint)
+            if rate is None:
+                rate = self.rates.get(endpoint.rpartition('.')[2], self.default)
+            sampled = g.log_sampled = rate >= 1 or random.random() < rate
+        return sampled
+
+
+def parse_rates(spec):
+    rates = {}
+    for item in filter(None, (part.strip() for part in (spec or '').split(','))):
+        route, _, rate = item.partition('=')
+        rates[route.strip()] = float(rate)
+    return rates
+
+
+def configure(level=None, sample=None, stream=None):
+    # Replaces the root handlers with the queue pipeline; safe to call again
+    global _listener
+    level = level or os.environ.get('LIFESIM_LOG_LEVEL', 'INFO')
+    rates = parse_rates(os.environ.get('LIFESIM_LOG_SAMPLE') if sample is None else sample)
+    if _listener is not None:
+        _listener.stop()
+    records = queue.SimpleQueue()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(logging.Formatter(LOG_FORMAT))
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    handler = LazyQueueHandler(records)
+    handler.addFilter(RouteSampler(rates))
+    root = logging.getLogger()
+    for old in list(root.handlers):
+        root.removeHandler(old)
+    root.addHandler(handler)
+    root.setLevel(level)
+    _listener.start()
+    return _listener
+
+
+def shutdown():
+    # Drains the queue; registered to run at exit
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown)
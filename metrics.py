@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Counters and histograms rendered in the Prometheus text format. Collection is
+# off unless LIFESIM_METRICS=1 (or enable() is called); while off, every
+# recording call returns after a single flag check and timers are a shared
+# no-op context manager, so instrumented hot paths cost next to nothing.
+
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+SIZE_BUCKETS = (256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536, 131072, 262144, 1048576)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+enabled = os.environ.get('LIFESIM_METRICS', '') == '1'
+_metrics = []
+_lock = threading.Lock()
+
+
+def enable(on=True):
+    global enabled
+    enabled = on
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.values = {}
+        _metrics.append(self)
+
+    def inc(self, amount=1, **labels):
+        if not enabled:
+            return
+        key = _label_key(labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        for key, value in sorted(self.values.items()):
+            yield f"{self.name}{_format_labels(key)} {value}"
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        # label key -> [per-bucket counts (+Inf last), sum]
+        self.values = {}
+        _metrics.append(self)
+
+    def observe(self, value, **labels):
+        if not enabled:
+            return
+        key = _label_key(labels)
+        i = bisect_left(self.buckets, value)
+        with _lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][i] += 1
+            entry[1] += value
+
+    def time(self, **labels):
+        return _Timer(self, labels) if enabled else NULL_TIMER
+
+    def samples(self):
+        for key, (counts, total) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + ('+Inf',), counts):
+                cumulative += n
+                yield f"{self.name}_bucket{_format_labels(key, [('le', bound)])} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(key)} {total}"
+            yield f"{self.name}_count{_format_labels(key)} {cumulative}"
+
+
+def render():
+    lines = []
+    with _lock:
+        for metric in _metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    with _lock:
+        for metric in _metrics:
+            metric.values.clear()
+
+
+REQUEST_SECONDS = Histogram('lifesim_request_seconds', "Request latency by route")
+PHASE_SECONDS = Histogram('lifesim_phase_seconds', "Time spent in each request and simulation phase")
+EVENTS_TOTAL = Counter('lifesim_events_total', "Events fired, by event type")
+DEATHS_TOTAL = Counter('lifesim_deaths_total', "Player deaths, by socio-economic class")
+SESSION_BYTES = Histogram('lifesim_session_bytes', "Serialized size of saved game state", SIZE_BUCKETS)
@@ -0,0 +1,121 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from game_changer import LifeSimulator, SocioEconomicClass, RULES
+from results import ResultsWriter
+from stats import LifeAggregator
+
+# Monte Carlo runner: plays whole lives through LifeSimulator with an
+# auto-choice policy and fans them out over worker processes. Life i is seeded
+# from (seed, i) and lives are split into fixed-size chunks merged in order, so
+# the same seed gives the same output whatever the number of workers. Per-life
+# records can also be written to a columnar results store (see results.py), in
+# life order.
+
+CHUNK_SIZE = 500
+
+
+def first_choice(game):
+    return 0
+
+
+def random_choice(game):
+    return game.rng.randrange(len(game.current_event['choices']))
+
+
+def life_seed(seed, i):
+    return f"{seed}/{i}"
+
+
+def simulate_life(seed, policy=first_choice, socio_class=None):
+    game = LifeSimulator(seed=seed)
+    rng = game.rng
+    game.create_character(
+        first_name=rng.choice(RULES.first_names),
+        last_name=rng.choice(RULES.last_names),
+        gender=rng.choice(RULES.genders),
+        socio_class=socio_class or rng.choice(list(SocioEconomicClass)),
+        nationality=rng.choice(RULES.nationalities),
+        religion=rng.choice(RULES.religions)
+    )
+    birth_class = game.determine_socio_class()
+    game.handle_choice(0)
+    # Wealth only falls through choices, so its peak is seen before them
+    peak_wealth = game.player.wealth
+    while not game.paused or game.current_event:
+        if game.current_event:
+            if game.current_event['title'] == "Life Complete":
+                break
+            peak_wealth = max(peak_wealth, game.player.wealth)
+            game.handle_choice(policy(game))
+        else:
+            game.fast_forward(RULES.death['max_age'])
+    player = game.player
+    return {
+        'birth_class': str(birth_class),
+        'lifespan': player.age,
+        'education': str(player.education) if player.education else "None",
+        'peak_wealth': max(peak_wealth, player.wealth),
+        'generation': game.generation,
+        'wealth': player.wealth,
+        'family_assets': game.family_assets,
+        'socio_class': str(game.determine_socio_class()),
+        'nationality': str(player.nationality),
+        'religion': str(player.religion),
+        # Last job held: almost everyone has retired by the time they die
+        'job': player.job or game.career or "None",
+        'married': player.is_married,
+        'children': len(player.children)
+    }
+
+
+def simulate_chunk(seed, start, stop, policy=first_choice, socio_class=None, records=False):
+    # (aggregate, the lives themselves if `records`, else None)
+    aggregate = LifeAggregator()
+    lives = [] if records else None
+    for i in range(start, stop):
+        life = simulate_life(life_seed(seed, i), policy, socio_class)
+        aggregate.add(life)
+        if records:
+            lives.append(life)
+    return aggregate, lives
+
+
+def run(lives, seed=0, workers=None, policy=first_choice, socio_class=None, chunk_size=CHUNK_SIZE, results=None):
+    # workers=1 runs in this process; policy must be a module-level function
+    # so it can be sent to the workers. `results` is a results store
+    # directory to append every life to.
+    work = partial(simulate_chunk, seed, policy=policy, socio_class=socio_class, records=results is not None)
+    starts = range(0, lives, chunk_size)
+    stops = [min(start + chunk_size, lives) for start in starts]
+    aggregate = LifeAggregator()
+    writer = ResultsWriter(results) if results is not None else None
+    try:
+        if workers == 1:
+            chunks = map(work, starts, stops)
+            for chunk, records in chunks:
+                aggregate.merge(chunk)
+                if writer:
+                    writer.extend(records)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for chunk, records in executor.map(work, starts, stops):
+                    aggregate.merge(chunk)
+                    if writer:
+                        writer.extend(records)
+    finally:
+        if writer:
+            writer.close()
+    return aggregate
+
+
+if __name__ == '__main__':
+    import json
+    import sys
+    import time
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    results = sys.argv[3] if len(sys.argv) > 3 else None
+    start = time.perf_counter()
+    result = run(n, seed=0, workers=workers, results=results).to_dict()
+    print(f"Simulated {n:,} lives in {time.perf_counter() - start:.2f}s")
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,48 @@
+import random
+
+# Pool of candidate persons (partners, children, adoptees). Rows are
+# stratified by (nationality, religion, age) with age varying fastest: all
+# candidates of one nationality and religion within an age range are one
+# contiguous block of rows, found by arithmetic instead of a search. A row only
+# fixes those three; the rest of a candidate (gender, names, health,
+# intelligence) is drawn from a seed the game picks with its own RNG, so every
+# pick is a new person, and an event needs only (row, seed) to show and then
+# produce the same candidate.
+
+MAX_AGE = 100
+
+
+class CandidatePool:
+    def __init__(self, rules, max_age=MAX_AGE):
+        self.rules = rules
+        self.max_age = max_age
+        self.nationalities = {n: i for i, n in enumerate(rules.nationalities)}
+        self.religions = {r: i for i, r in enumerate(rules.religions)}
+
+    def __len__(self):
+        return len(self.nationalities) * len(self.religions) * (self.max_age + 1)
+
+    def match(self, rng, nationality, religion, min_age, max_age):
+        # A random row of that nationality and religion aged min_age..max_age
+        # (clamped to the pool's ages)
+        min_age = min(max(min_age, 0), self.max_age)
+        max_age = min(max(max_age, min_age), self.max_age)
+        block = (self.nationalities[nationality] * len(self.religions) + self.religions[religion]) * (self.max_age + 1)
+        return rng.randrange(block + min_age, block + max_age + 1)
+
+    def row(self, index, seed):
+        # Fields of the candidate for (row, seed) as keyword arguments for
+        # Person, plus age
+        rules = self.rules
+        cell, age = divmod(index, self.max_age + 1)
+        nationality, religion = divmod(cell, len(rules.religions))
+        draws = random.Random(seed)
+        return {
+            'first_name': draws.choice(rules.first_names),
+            'last_name': draws.choice(rules.last_names),
+            'gender': draws.choice(rules.genders),
+            'nationality': rules.nationalities[nationality],
+            'religion': rules.religions[religion],
+            'health': draws.randint(50, 90),
+            'intelligence': draws.randint(40, 80)
+        }, age
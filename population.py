@@ -0,0 +1,233 @@
+import numpy as np
+from game_changer import SocioEconomicClass, RULES
+
+# Batch engine: a cohort of N lives stored as columns (structure of arrays),
+# advanced one year per tick with the same aging, salary, retirement and death
+# rules as LifeSimulator. Everyone in a cohort is born the same year, so age is
+# a scalar and the age bands reduce to plain branches. Dead lives are copied to
+# the result columns and compacted out, so each tick only touches the living.
+
+POOR, MIDDLE, WEALTHY = (c.value for c in SocioEconomicClass)
+
+# Indexed by SocioEconomicClass.value (index 0 unused)
+HEALTH_MOD = np.array([0.0] + [RULES.classes[c].health_mod for c in SocioEconomicClass])
+WEALTH_MOD = np.array([0.0] + [RULES.classes[c].wealth_mod for c in SocioEconomicClass])
+DEATH_MOD = np.array([0.0] + [RULES.classes[c].death_mod for c in SocioEconomicClass])
+
+# Job codes: 0 is unemployed, then coming-of-age, per-class and bonus jobs
+NO_JOB = 0
+JOBS = list(RULES.starter_jobs.values())
+STARTER_JOBS = np.arange(1, len(JOBS) + 1)
+CLASS_JOBS = {}
+for _socio_class, _class_rules in RULES.classes.items():
+    CLASS_JOBS[_socio_class.value] = np.arange(len(JOBS) + 1, len(JOBS) + 1 + len(_class_rules.jobs))
+    JOBS.extend(_class_rules.jobs)
+BONUS_JOBS = []
+for _bonus_job in RULES.bonus_jobs:
+    JOBS.append(_bonus_job.job)
+    BONUS_JOBS.append((len(JOBS), {c.value for c in _bonus_job.classes}, _bonus_job.minimums))
+JOB_NAMES = ["None"] + [job.name for job in JOBS]
+JOB_SALARY = np.array([0] + [job.salary for job in JOBS], dtype=np.float64)
+JOB_EFFECTS = [
+    (code, stat, amount)
+    for code, name in enumerate(JOB_NAMES)
+    for stat, amount in RULES.job_effects.get(name, ())
+]
+AGING = RULES.aging
+DEATH = RULES.death
+RETIREMENT = RULES.retirement
+
+LIFE_COLUMNS = ('health', 'intelligence', 'charisma', 'wealth', 'family_assets', 'salary', 'job', 'career', 'college', 'socio_class')
+
+
+class Population:
+    def __init__(self, size, socio_class=None, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.size = size
+        self.age = 0
+        if socio_class is None:
+            drawn = self.rng.integers(POOR, WEALTHY + 1, size, dtype=np.int8)
+        else:
+            drawn = np.full(size, socio_class.value, dtype=np.int8)
+        family_wealth = np.zeros(size)
+        for c, class_rules in RULES.classes.items():
+            mask = drawn == c.value
+            low, high = class_rules.starting_wealth
+            family_wealth[mask] = self.rng.integers(low, high + 1, mask.sum())
+        # Class is derived from family wealth exactly as determine_socio_class() does
+        self.socio_class = np.full(size, WEALTHY, dtype=np.int8)
+        for c, max_family_wealth in reversed(RULES.class_thresholds):
+            if max_family_wealth is not None:
+                self.socio_class[family_wealth < max_family_wealth] = c.value
+        self.family_assets = family_wealth
+        self.health = self.rng.integers(50, 91, size).astype(np.float64)
+        self.intelligence = self.rng.integers(40, 81, size).astype(np.float64)
+        self.charisma = np.full(size, 50.0)
+        self.wealth = family_wealth * 0.2
+        self.job = np.zeros(size, dtype=np.int8)
+        # Last job held, kept through retirement
+        self.career = np.zeros(size, dtype=np.int8)
+        self.salary = np.zeros(size)
+        self.college = np.zeros(size, dtype=bool)
+        # Row -> original life index, used to write out the dead
+        self.ids = np.arange(size)
+        self.results = {name: np.zeros(size, dtype=getattr(self, name).dtype) for name in LIFE_COLUMNS}
+        self.results['age'] = np.zeros(size, dtype=np.int16)
+        self.refresh_modifiers()
+
+    @property
+    def alive(self):
+        return len(self.ids)
+
+    def refresh_modifiers(self):
+        self.health_mod = HEALTH_MOD[self.socio_class]
+        self.wealth_mod = WEALTH_MOD[self.socio_class]
+        self.death_mod = DEATH_MOD[self.socio_class]
+
+    def tick(self):
+        self.age += 1
+        self.update_stats()
+        self.check_death()
+        self.process_year_events()
+
+    def update_stats(self):
+        age = self.age
+        if age < AGING['youth_until']:
+            youth = AGING['youth']
+            self.intelligence += youth['intelligence']
+            np.minimum(self.intelligence, 100, out=self.intelligence)
+            self.health += youth['health'] + self.health_mod
+            np.minimum(self.health, 100, out=self.health)
+            self.charisma += youth['charisma']
+            np.minimum(self.charisma, 100, out=self.charisma)
+        elif age > AGING['decline_after']:
+            self.health -= AGING['decline'] + self.health_mod
+            if age > AGING['elderly_after']:
+                np.maximum(self.health, 0, out=self.health)
+                self.health -= AGING['elderly'] + self.health_mod
+            np.maximum(self.health, 0, out=self.health)
+
+        # Retirement
+        if age >= RETIREMENT['age']:
+            retiring = np.flatnonzero(self.job != NO_JOB)
+            if len(retiring):
+                self.job[retiring] = NO_JOB
+                self.salary[retiring] = 0
+                wealth = self.wealth[retiring]
+                pension = np.minimum(wealth * RETIREMENT['pension_rate'], RETIREMENT['pension_cap'])
+                self.wealth[retiring] += np.where(wealth > 0, pension, 0)
+            return
+
+        if age < 18:
+            return
+        monthly = self.salary / 12
+        self.wealth += monthly * self.wealth_mod
+        self.family_assets += monthly * 0.1
+        for job, stat, amount in JOB_EFFECTS:
+            idx = np.flatnonzero(self.job == job)
+            if len(idx):
+                column = getattr(self, stat)
+                column[idx] = np.minimum(100, column[idx] + amount)
+
+    def check_death(self):
+        if self.age >= DEATH['max_age']:
+            self.bury(np.ones(self.alive, dtype=bool))
+            return
+        if self.age < DEATH['min_age']:
+            return
+        threshold = DEATH['health_threshold']
+        at_risk = np.flatnonzero(self.health < threshold)
+        if len(at_risk):
+            chance = (threshold - self.health[at_risk]) * DEATH['health_factor'] + (self.age - DEATH['min_age']) * DEATH['age_factor']
+            chance *= self.death_mod[at_risk]
+            died = np.zeros(self.alive, dtype=bool)
+            died[at_risk[self.rng.random(len(at_risk)) < chance]] = True
+            if died.any():
+                self.bury(died)
+
+    def bury(self, died):
+        ids = self.ids[died]
+        self.results['age'][ids] = self.age
+        keep = ~died
+        for name in LIFE_COLUMNS:
+            column = getattr(self, name)
+            self.results[name][ids] = column[died]
+            setattr(self, name, column[keep])
+        self.ids = self.ids[keep]
+        self.refresh_modifiers()
+
+    def process_year_events(self):
+        # Auto-choice policies: at 18 go to college whenever the game offers it
+        # (not poor and able to pay), otherwise take a random starter job;
+        # unemployed adults accept a random class job.
+        age = self.age
+        if age == 18:
+            cost = RULES.costs['college']
+            college = (self.wealth >= cost) & (self.socio_class != POOR)
+            self.college |= college
+            self.wealth -= college * cost
+            self.family_assets -= college * cost
+            starter = np.flatnonzero(~college)
+            self.hire(starter, STARTER_JOBS[self.rng.integers(0, len(STARTER_JOBS), len(starter))])
+        elif RULES.events['job'].min_age <= age <= RULES.events['job'].max_age:
+            seeking = np.flatnonzero(self.job == NO_JOB)
+            seeking = seeking[self.rng.random(len(seeking)) < RULES.events['job'].chance]
+            classes = self.socio_class[seeking]
+            for c, jobs in CLASS_JOBS.items():
+                idx = seeking[classes == c]
+                self.hire(idx, self.pick_class_job(idx, c, jobs))
+
+    def pick_class_job(self, idx, c, jobs):
+        choice = jobs[self.rng.integers(0, len(jobs), len(idx))]
+        # Bonus jobs are taken whenever the person qualifies for them
+        for code, classes, minimums in BONUS_JOBS:
+            if c not in classes:
+                continue
+            qualifies = np.ones(len(idx), dtype=bool)
+            for stat, minimum in minimums:
+                qualifies &= getattr(self, stat)[idx] >= minimum
+            choice = np.where(qualifies, code, choice)
+        return choice
+
+    def hire(self, idx, jobs):
+        self.job[idx] = jobs
+        self.career[idx] = jobs
+        self.salary[idx] = JOB_SALARY[jobs]
+
+    def run(self, max_years=100):
+        while self.alive and self.age < max_years:
+            self.tick()
+        return self
+
+    def summary(self):
+        results = self.results
+        return {
+            'lives': self.size,
+            'mean_lifespan': float(results['age'].mean()),
+            'mean_wealth': float(results['wealth'].mean()),
+            'mean_family_assets': float(results['family_assets'].mean()),
+            'college_rate': float(results['college'].mean()),
+            'jobs': self.job_counts()
+        }
+
+    def job_counts(self):
+        # By last job held, as almost everyone is retired at death
+        counts = {}
+        for j, n in enumerate(np.bincount(self.results['career'], minlength=len(JOB_NAMES))):
+            if n:
+                counts[JOB_NAMES[j]] = counts.get(JOB_NAMES[j], 0) + int(n)
+        return counts
+
+
+def simulate(size, socio_class=None, seed=None, max_years=100):
+    return Population(size, socio_class=socio_class, seed=seed).run(max_years).summary()
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    start = time.perf_counter()
+    result = simulate(n, seed=0)
+    print(f"Simulated {n:,} lives in {time.perf_counter() - start:.2f}s")
+    print(result)
@@ -0,0 +1,204 @@
+import json
+import os
+import numpy as np
+
+# Columnar store for per-life batch results. A store is a directory with one
+# file of fixed-width little-endian values per column and a meta.json holding
+# the schema, the dictionaries of the encoded columns and the committed row
+# count. Writers append buffered chunks to every column file and then replace
+# meta.json, so readers never see a half-written chunk (and a writer reopening
+# the store drops any torn tail). Readers memory-map the columns and filter and
+# group in fixed-size blocks, so queries over tens of millions of lives only
+# touch the columns they use and never hold them in memory whole.
+
+META = 'meta.json'
+CHUNK_ROWS = 65536
+BLOCK_ROWS = 1 << 20
+
+# (name, dtype, dictionary-encoded); montecarlo.simulate_life() records.
+# `job` is the last job held, as almost everyone retires before they die.
+SCHEMA = (
+    ('birth_class', '<u1', True),
+    ('nationality', '<u1', True),
+    ('religion', '<u1', True),
+    ('lifespan', '<u1', False),
+    ('education', '<u1', True),
+    ('job', '<u2', True),
+    ('peak_wealth', '<f8', False),
+    ('children', '<u2', False),
+    ('generation', '<u2', False)
+)
+FIELDS = tuple(name for name, _, _ in SCHEMA)
+
+
+def _read_meta(path):
+    with open(os.path.join(path, META)) as f:
+        return json.load(f)
+
+
+class ResultsWriter:
+    def __init__(self, path, chunk_rows=CHUNK_ROWS):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self._pending = []
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, META)):
+            meta = _read_meta(path)
+            if [c['name'] for c in meta['columns']] != list(FIELDS):
+                raise ValueError(f"{path}: written with a different schema")
+            self.rows = meta['rows']
+            self.dictionaries = {c['name']: c['dictionary'] for c in meta['columns'] if c['dictionary'] is not None}
+        else:
+            self.rows = 0
+            self.dictionaries = {name: [] for name, _, encoded in SCHEMA if encoded}
+        self._codes = {name: {value: code for code, value in enumerate(values)} for name, values in self.dictionaries.items()}
+        # Drop whatever an interrupted writer appended after the last commit
+        for name, dtype, _ in SCHEMA:
+            column = os.path.join(path, f"{name}.bin")
+            with open(column, 'ab') as f:
+                f.truncate(self.rows * np.dtype(dtype).itemsize)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def add(self, record):
+        self._pending.append(tuple(record[name] for name in FIELDS))
+        if len(self._pending) >= self.chunk_rows:
+            self.flush()
+
+    def extend(self, records):
+        for record in records:
+            self.add(record)
+
+    def flush(self):
+        if not self._pending:
+            return
+        for i, (name, dtype, encoded) in enumerate(SCHEMA):
+            values = [row[i] for row in self._pending]
+            if encoded:
+                values = [self._encode(name, value) for value in values]
+            with open(os.path.join(self.path, f"{name}.bin"), 'ab') as f:
+                f.write(np.asarray(values, dtype=dtype).tobytes())
+        self.rows += len(self._pending)
+        self._pending = []
+        self._commit()
+
+    def close(self):
+        self.flush()
+        if not os.path.exists(os.path.join(self.path, META)):
+            self._commit()
+
+    def _encode(self, name, value):
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self.dictionaries[name].append(value)
+        return code
+
+    def _commit(self):
+        meta = {
+            'version': 1,
+            'rows': self.rows,
+            'columns': [{'name': name, 'dtype': dtype, 'dictionary': self.dictionaries.get(name)} for name, dtype, _ in SCHEMA]
+        }
+        tmp = os.path.join(self.path, META + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.path, META))
+
+
+class ResultsStore:
+    def __init__(self, path):
+        self.path = path
+        meta = _read_meta(path)
+        self.rows = meta['rows']
+        self.dtypes = {c['name']: np.dtype(c['dtype']) for c in meta['columns']}
+        self.dictionaries = {c['name']: c['dictionary'] for c in meta['columns'] if c['dictionary'] is not None}
+        self._columns = {}
+
+    def __len__(self):
+        return self.rows
+
+    def column(self, name):
+        # The raw column, memory-mapped; encoded columns hold codes
+        column = self._columns.get(name)
+        if column is None:
+            dtype = self.dtypes[name]
+            if self.rows:
+                column = np.memmap(os.path.join(self.path, f"{name}.bin"), dtype=dtype, mode='r', shape=(self.rows,))
+            else:
+                column = np.empty(0, dtype=dtype)
+            self._columns[name] = column
+        return column
+
+    def code(self, name, value):
+        # Code of `value` in an encoded column, or -1 if it never occurs
+        try:
+            return self.dictionaries[name].index(value)
+        except ValueError:
+            return -1
+
+    def blocks(self, block_rows=BLOCK_ROWS):
+        for start in range(0, self.rows, block_rows):
+            yield start, min(start + block_rows, self.rows)
+
+    def mask(self, start, stop, where):
+        # Rows of [start, stop) matching `where`: {column: value} tests
+        # equality (decoded values for encoded columns), {column: (low, high)}
+        # a half-open range
+        keep = np.ones(stop - start, dtype=bool)
+        for name, test in where.items():
+            values = self.column(name)[start:stop]
+            if isinstance(test, tuple):
+                low, high = test
+                if low is not None:
+                    keep &= values >= low
+                if high is not None:
+                    keep &= values < high
+            else:
+                keep &= values == (self.code(name, test) if name in self.dictionaries else test)
+        return keep
+
+    def count(self, where=None):
+        if not where:
+            return self.rows
+        return sum(int(self.mask(start, stop, where).sum()) for start, stop in self.blocks())
+
+    def group_by(self, key, value=None, where=None):
+        # {key value: {'count', 'mean'}} of `value` (or just counts) per
+        # group of an encoded column, over the rows matching `where`
+        size = len(self.dictionaries[key])
+        counts = np.zeros(size, dtype=np.int64)
+        sums = np.zeros(size)
+        for start, stop in self.blocks():
+            groups = self.column(key)[start:stop]
+            values = self.column(value)[start:stop] if value else None
+            if where:
+                keep = self.mask(start, stop, where)
+                groups = groups[keep]
+                values = values[keep] if value else None
+            counts += np.bincount(groups, minlength=size)
+            if value:
+                sums += np.bincount(groups, weights=values, minlength=size)
+        result = {}
+        for code, name in enumerate(self.dictionaries[key]):
+            if counts[code]:
+                result[name] = {'count': int(counts[code])}
+                if value:
+                    result[name]['mean'] = float(sums[code] / counts[code])
+        return result
+
+
+if __name__ == '__main__':
+    import sys
+    # results.py DIR [KEY [VALUE]]: group counts (and means of VALUE)
+    store = ResultsStore(sys.argv[1])
+    key = sys.argv[2] if len(sys.argv) > 2 else 'birth_class'
+    value = sys.argv[3] if len(sys.argv) > 3 else 'lifespan'
+    print(f"{len(store):,} lives")
+    print(json.dumps(store.group_by(key, value), indent=2))
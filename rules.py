@@ -0,0 +1,147 @@
+import json
+import os
+from collections import namedtuple
+
+# Game balance data. rules.json is read and validated once at startup and
+# turned into lookup tables keyed by the game's enums, so the engine never
+# rebuilds them per call. Point LIFESIM_RULES at another file to tune balance.
+
+RULES_PATH = os.environ.get('LIFESIM_RULES', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rules.json'))
+
+Job = namedtuple('Job', 'name salary')
+ClassRules = namedtuple('ClassRules', 'max_family_wealth starting_wealth education health_mod wealth_mod death_mod description jobs')
+BonusJob = namedtuple('BonusJob', 'job classes minimums')
+EventRules = namedtuple('EventRules', 'min_age max_age chance')
+
+STATS = ('health', 'intelligence', 'charisma')
+
+
+class RulesError(ValueError):
+    pass
+
+
+def _number(value, where):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise RulesError(f"{where}: expected a number, got {value!r}")
+    return value
+
+
+def _section(data, key, where='rules'):
+    if key not in data:
+        raise RulesError(f"{where}: missing '{key}'")
+    return data[key]
+
+
+def _job(value, where):
+    if not isinstance(value, list) or len(value) != 2 or not isinstance(value[0], str):
+        raise RulesError(f"{where}: expected [name, salary], got {value!r}")
+    return Job(value[0], _number(value[1], where))
+
+
+class Rules:
+    def __init__(self, data, socio_classes, education_levels, nationalities, religions):
+        classes = _section(data, 'classes')
+        self.classes = {}
+        for socio_class in socio_classes:
+            where = f"classes.{socio_class.name}"
+            entry = _section(classes, socio_class.name, 'classes')
+            low, high = (_number(v, where) for v in _section(entry, 'starting_wealth', where))
+            if low > high:
+                raise RulesError(f"{where}.starting_wealth: {low} > {high}")
+            max_family_wealth = entry.get('max_family_wealth')
+            try:
+                education = tuple(education_levels[e] for e in _section(entry, 'education', where))
+            except KeyError as e:
+                raise RulesError(f"{where}.education: unknown level {e}")
+            if not education:
+                raise RulesError(f"{where}.education: empty")
+            self.classes[socio_class] = ClassRules(
+                max_family_wealth=None if max_family_wealth is None else _number(max_family_wealth, where),
+                starting_wealth=(low, high),
+                education=education,
+                health_mod=_number(_section(entry, 'health_mod', where), where),
+                wealth_mod=_number(_section(entry, 'wealth_mod', where), where),
+                death_mod=_number(_section(entry, 'death_mod', where), where),
+                description=_section(entry, 'description', where),
+                jobs=tuple(_job(job, f"{where}.jobs") for job in _section(entry, 'jobs', where))
+            )
+        # Class thresholds, ascending; the last class has no upper bound
+        self.class_thresholds = tuple((c, r.max_family_wealth) for c, r in self.classes.items())
+        if self.class_thresholds[-1][1] is not None or any(limit is None for _, limit in self.class_thresholds[:-1]):
+            raise RulesError("classes: only the last class may omit max_family_wealth")
+
+        self.bonus_jobs = []
+        for i, entry in enumerate(_section(data, 'bonus_jobs')):
+            where = f"bonus_jobs[{i}]"
+            try:
+                job_classes = frozenset(socio_classes[c] for c in _section(entry, 'classes', where))
+            except KeyError as e:
+                raise RulesError(f"{where}.classes: unknown class {e}")
+            minimums = tuple(_section(entry, 'minimums', where).items())
+            for stat, value in minimums:
+                if stat not in STATS:
+                    raise RulesError(f"{where}.minimums: unknown stat '{stat}'")
+                _number(value, where)
+            job = Job(_section(entry, 'name', where), _number(_section(entry, 'salary', where), where))
+            self.bonus_jobs.append(BonusJob(job, job_classes, minimums))
+        self.bonus_jobs = tuple(self.bonus_jobs)
+
+        self.starter_jobs = {key: _job(job, f"starter_jobs.{key}") for key, job in _section(data, 'starter_jobs').items()}
+        self.job_effects = {}
+        for name, effects in _section(data, 'job_effects').items():
+            for stat, amount in effects.items():
+                if stat not in STATS:
+                    raise RulesError(f"job_effects.{name}: unknown stat '{stat}'")
+                _number(amount, f"job_effects.{name}")
+            self.job_effects[name] = tuple(effects.items())
+
+        currency = _section(data, 'currency')
+        self.currency = {}
+        for nationality in nationalities:
+            code, symbol = _section(currency, str(nationality), 'currency')
+            self.currency[nationality] = (code, symbol)
+        self.default_currency = self.currency[next(iter(nationalities))]
+
+        self.costs = {key: _number(value, f"costs.{key}") for key, value in _section(data, 'costs').items()}
+        self.aging = _section(data, 'aging')
+        self.death = _section(data, 'death')
+        self.retirement = _section(data, 'retirement')
+        for section, keys in (('aging', ('youth_until', 'decline_after', 'decline', 'elderly_after', 'elderly')),
+                              ('death', ('max_age', 'min_age', 'health_threshold', 'health_factor', 'age_factor')),
+                              ('retirement', ('age', 'pension_rate', 'pension_cap'))):
+            for key in keys:
+                _number(_section(getattr(self, section), key, section), f"{section}.{key}")
+        for stat, amount in _section(self.aging, 'youth', 'aging').items():
+            if stat not in STATS:
+                raise RulesError(f"aging.youth: unknown stat '{stat}'")
+            _number(amount, 'aging.youth')
+
+        self.events = {}
+        for name, entry in _section(data, 'events').items():
+            where = f"events.{name}"
+            min_age, max_age = _section(entry, 'ages', where)
+            chance = _number(_section(entry, 'chance', where), where)
+            if not 0 <= chance <= 1:
+                raise RulesError(f"{where}.chance: {chance} is not a probability")
+            self.events[name] = EventRules(_number(min_age, where), None if max_age is None else _number(max_age, where), chance)
+
+        names = _section(data, 'names')
+        self.first_names = tuple(_section(names, 'first', 'names'))
+        self.last_names = tuple(_section(names, 'last', 'names'))
+        self.genders = tuple(_section(names, 'genders', 'names'))
+        if not (self.first_names and self.last_names and self.genders):
+            raise RulesError("names: first, last and genders must not be empty")
+
+        self.nationalities = tuple(nationalities)
+        self.religions = tuple(religions)
+        self.nationality_by_name = {str(n): n for n in nationalities}
+        self.religion_by_name = {str(r): r for r in religions}
+
+
+def load(socio_classes, education_levels, nationalities, religions, path=RULES_PATH):
+    with open(path, encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise RulesError(f"{path}: {e}")
+    return Rules(data, socio_classes, education_levels, nationalities, religions)
@@ -0,0 +1,222 @@
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+import metrics
+
+# Server-side game state stores. The session cookie only carries an opaque id;
+# the game itself lives here and expires after `ttl` seconds without access.
+# Each entry is a full snapshot followed by the deltas written since; a new
+# snapshot replaces both every SNAPSHOT_EVERY saves.
+
+SNAPSHOT_EVERY = 20
+
+
+def new_session_id():
+    return secrets.token_urlsafe(24)
+
+
+def apply_delta(state, delta):
+    # Delta keys are dotted paths into the state, e.g. 'player.age'
+    for path, value in delta.items():
+        target = state
+        *parents, key = path.split('.')
+        for parent in parents:
+            target = target[parent]
+        target[key] = value
+    return state
+
+
+def load_state(store, sid):
+    # (state dict, deltas since snapshot) without building a game; the dict
+    # may be the store's own copy, so treat it as read-only
+    with metrics.PHASE_SECONDS.time(phase='session_load'):
+        return store.load(sid)
+
+
+def load_game(store, sid, game_cls):
+    entry = load_state(store, sid)
+    if entry is None:
+        return None
+    data, deltas = entry
+    with metrics.PHASE_SECONDS.time(phase='from_dict'):
+        game = game_cls.from_dict(data)
+    game.deltas_since_snapshot = deltas
+    return game
+
+
+def save_game(store, sid, game):
+    if game.is_dirty():
+        game.state_version += 1
+    with metrics.PHASE_SECONDS.time(phase='save'):
+        if game.deltas_since_snapshot is None or game.deltas_since_snapshot >= SNAPSHOT_EVERY:
+            _save_snapshot(store, sid, game)
+        else:
+            delta = game.to_delta()
+            if delta:
+                if store.append(sid, delta):
+                    game.deltas_since_snapshot += 1
+                    if metrics.enabled:
+                        metrics.SESSION_BYTES.observe(len(json.dumps(delta)), kind='delta')
+                else:
+                    # The snapshot expired or was evicted under us
+                    _save_snapshot(store, sid, game)
+        game.clear_dirty()
+
+
+def _save_snapshot(store, sid, game):
+    data = game.to_dict()
+    store.set(sid, data)
+    game.deltas_since_snapshot = 0
+    if metrics.enabled:
+        metrics.SESSION_BYTES.observe(len(json.dumps(data)), kind='snapshot')
+
+
+class MemoryStore:
+    # In-process LRU. Every access refreshes the expiry, so the least recently
+    # used entry is also the one closest to expiring.
+    def __init__(self, ttl=86400, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Deltas are applied to the stored snapshot as they arrive, so a load
+    # returns the merged state and the number of deltas folded into it.
+    def load(self, sid):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(sid)
+            if entry is None:
+                return None
+            expires, data, deltas = entry
+            if expires <= now:
+                del self._entries[sid]
+                return None
+            self._entries[sid] = (now + self.ttl, data, deltas)
+            self._entries.move_to_end(sid)
+            return data, deltas
+
+    def set(self, sid, data):
+        now = time.monotonic()
+        with self._lock:
+            self._entries[sid] = (now + self.ttl, data, 0)
+            self._entries.move_to_end(sid)
+            self._evict(now)
+
+    def append(self, sid, delta):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(sid)
+            if entry is None:
+                return False
+            _, data, deltas = entry
+            self._entries[sid] = (now + self.ttl, apply_delta(data, delta), deltas + 1)
+            self._entries.move_to_end(sid)
+            return True
+
+    def delete(self, sid):
+        with self._lock:
+            self._entries.pop(sid, None)
+
+    def _evict(self, now):
+        while self._entries:
+            sid, (expires, _, _) = next(iter(self._entries.items()))
+            if expires > now and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[sid]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteStore:
+    # Local SQLite file, shared by every process on the host. Snapshots and
+    # deltas are stored as JSON text; expired rows are purged on write.
+    PURGE_INTERVAL = 60
+
+    def __init__(self, path, ttl=86400):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        self._last_purge = 0
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS games ("
+                "sid TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS games_expires ON games (expires)")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS game_deltas ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, sid TEXT NOT NULL, data TEXT NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS game_deltas_sid ON game_deltas (sid, id)")
+
+    def _connect(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def load(self, sid):
+        now = time.time()
+        db = self._connect()
+        row = db.execute("SELECT data, expires FROM games WHERE sid = ?", (sid,)).fetchone()
+        if row is None or row[1] <= now:
+            return None
+        deltas = db.execute("SELECT data FROM game_deltas WHERE sid = ? ORDER BY id", (sid,)).fetchall()
+        with db:
+            db.execute("UPDATE games SET expires = ? WHERE sid = ?", (now + self.ttl, sid))
+        data = json.loads(row[0])
+        for (delta,) in deltas:
+            apply_delta(data, json.loads(delta))
+        return data, len(deltas)
+
+    def set(self, sid, data):
+        now = time.time()
+        db = self._connect()
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO games (sid, data, expires) VALUES (?, ?, ?)",
+                (sid, json.dumps(data, separators=(',', ':')), now + self.ttl)
+            )
+            db.execute("DELETE FROM game_deltas WHERE sid = ?", (sid,))
+            if now - self._last_purge > self.PURGE_INTERVAL:
+                db.execute("DELETE FROM game_deltas WHERE sid IN (SELECT sid FROM games WHERE expires <= ?)", (now,))
+                db.execute("DELETE FROM games WHERE expires <= ?", (now,))
+                self._last_purge = now
+
+    def append(self, sid, delta):
+        now = time.time()
+        db = self._connect()
+        with db:
+            updated = db.execute(
+                "UPDATE games SET expires = ? WHERE sid = ? AND expires > ?", (now + self.ttl, sid, now)
+            ).rowcount
+            if not updated:
+                return False
+            db.execute(
+                "INSERT INTO game_deltas (sid, data) VALUES (?, ?)",
+                (sid, json.dumps(delta, separators=(',', ':')))
+            )
+        return True
+
+    def delete(self, sid):
+        db = self._connect()
+        with db:
+            db.execute("DELETE FROM game_deltas WHERE sid = ?", (sid,))
+            db.execute("DELETE FROM games WHERE sid = ?", (sid,))
+
+
+def create_store(kind='memory', ttl=86400, path=None):
+    if kind == 'memory':
+        return MemoryStore(ttl=ttl)
+    if kind == 'sqlite':
+        return SQLiteStore(path or os.path.join(os.getcwd(), 'lifesim_sessions.db'), ttl=ttl)
+    raise ValueError(f"Unknown session store: {kind}")
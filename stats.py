@@ -0,0 +1,237 @@
+import math
+
+# Bounded-memory statistics over a stream of finished lives. Every collector
+# can merge with another of the same shape, so workers aggregate their own
+# lives and the parent merges the partial results.
+
+
+class RunningStats:
+    # Welford's online mean/variance; merge() is Chan et al.'s pairwise update
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        if not other.count:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    def to_dict(self):
+        if not self.count:
+            return {'count': 0}
+        return {'count': self.count, 'mean': self.mean, 'stdev': self.stdev, 'min': self.min, 'max': self.max}
+
+
+class Histogram:
+    # Fixed bins over [low, high); values outside land in the under/overflow
+    # counts. Quantiles are interpolated within a bin, so their error is at
+    # most one bin width.
+    def __init__(self, low, high, bins):
+        self.low = low
+        self.high = high
+        self.width = (high - low) / bins
+        self.counts = [0] * bins
+        self.underflow = 0
+        self.overflow = 0
+
+    def add(self, value):
+        if value < self.low:
+            self.underflow += 1
+        elif value >= self.high:
+            self.overflow += 1
+        else:
+            self.counts[int((value - self.low) / self.width)] += 1
+
+    def merge(self, other):
+        if (other.low, other.high, len(other.counts)) != (self.low, self.high, len(self.counts)):
+            raise ValueError("Cannot merge histograms with different bins")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    @property
+    def total(self):
+        return self.underflow + sum(self.counts) + self.overflow
+
+    def quantile(self, q):
+        total = self.total
+        if not total:
+            return None
+        rank = q * total
+        if rank <= self.underflow:
+            return self.low
+        seen = self.underflow
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                return self.low + (i + (rank - seen) / n) * self.width
+            seen += n
+        return self.high
+
+    def to_dict(self):
+        return {'low': self.low, 'high': self.high, 'counts': list(self.counts),
+                'underflow': self.underflow, 'overflow': self.overflow}
+
+
+class Distribution:
+    # Running moments plus a histogram for quantiles
+    QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+    def __init__(self, low, high, bins):
+        self.stats = RunningStats()
+        self.histogram = Histogram(low, high, bins)
+
+    def add(self, value):
+        self.stats.add(value)
+        self.histogram.add(value)
+
+    def merge(self, other):
+        self.stats.merge(other.stats)
+        self.histogram.merge(other.histogram)
+        return self
+
+    def quantile(self, q):
+        # Interpolation inside a bin can overshoot the observed range
+        value = self.histogram.quantile(q)
+        return None if value is None else min(self.stats.max, max(self.stats.min, value))
+
+    def to_dict(self):
+        summary = self.stats.to_dict()
+        if self.stats.count:
+            summary['quantiles'] = {f"p{round(q * 100)}": self.quantile(q) for q in self.QUANTILES}
+        return summary
+
+
+class LifeStats:
+    def __init__(self):
+        self.lifespan = Distribution(0, 101, 101)
+        self.wealth = Distribution(0, 500000, 100)
+        self.family_assets = Distribution(0, 1000000, 100)
+        self.children = Distribution(0, 10, 10)
+        self.married = 0
+        self.jobs = {}
+
+    @property
+    def lives(self):
+        return self.lifespan.stats.count
+
+    def add(self, life):
+        self.lifespan.add(life['lifespan'])
+        self.wealth.add(life['wealth'])
+        self.family_assets.add(life['family_assets'])
+        self.children.add(life['children'])
+        self.married += bool(life['married'])
+        self.jobs[life['job']] = self.jobs.get(life['job'], 0) + 1
+
+    def merge(self, other):
+        self.lifespan.merge(other.lifespan)
+        self.wealth.merge(other.wealth)
+        self.family_assets.merge(other.family_assets)
+        self.children.merge(other.children)
+        self.married += other.married
+        for job, n in other.jobs.items():
+            self.jobs[job] = self.jobs.get(job, 0) + n
+        return self
+
+    def to_dict(self):
+        lives = self.lives
+        return {
+            'lives': lives,
+            'lifespan': self.lifespan.to_dict(),
+            'wealth': self.wealth.to_dict(),
+            'family_assets': self.family_assets.to_dict(),
+            'children': self.children.to_dict(),
+            'married_rate': self.married / lives if lives else 0.0,
+            'jobs': dict(sorted(self.jobs.items()))
+        }
+
+
+class LifeAggregator:
+    # Life results (see montecarlo.simulate_life) are counted overall and per
+    # value of each grouping key
+    KEYS = ('socio_class', 'nationality', 'religion')
+
+    def __init__(self):
+        self.overall = LifeStats()
+        self.groups = {key: {} for key in self.KEYS}
+
+    def add(self, life):
+        self.overall.add(life)
+        for key in self.KEYS:
+            group = self.groups[key].get(life[key])
+            if group is None:
+                group = self.groups[key][life[key]] = LifeStats()
+            group.add(life)
+
+    def merge(self, other):
+        self.overall.merge(other.overall)
+        for key in self.KEYS:
+            groups = self.groups[key]
+            for value, stats in other.groups[key].items():
+                if value in groups:
+                    groups[value].merge(stats)
+                else:
+                    groups[value] = stats
+        return self
+
+    def to_dict(self):
+        report = self.overall.to_dict()
+        for key in self.KEYS:
+            report[f'by_{key}'] = {value: stats.to_dict() for value, stats in sorted(self.groups[key].items())}
+        return report
+
+
+class OutcomeStats:
+    # Results of rollouts from one choice (see advisor.rollout); rollouts
+    # that end without a life to follow are only counted
+    METRICS = ('lifespan', 'wealth', 'family_assets', 'family_size')
+
+    def __init__(self):
+        self.rollouts = 0
+        self.metrics = {name: RunningStats() for name in self.METRICS}
+
+    def add(self, outcome):
+        self.rollouts += 1
+        if outcome is not None:
+            for name, stats in self.metrics.items():
+                stats.add(outcome[name])
+
+    def merge(self, other):
+        self.rollouts += other.rollouts
+        for name, stats in self.metrics.items():
+            stats.merge(other.metrics[name])
+        return self
+
+    def to_dict(self):
+        summary = {'rollouts': self.rollouts}
+        for name, stats in self.metrics.items():
+            summary[name] = stats.to_dict()
+        return summary
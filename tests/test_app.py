@@ -0,0 +1,101 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app import create_app
+from journal import Journal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHARACTER = {'first_name': "Alex", 'last_name': "Smith", 'gender': "Female",
+             'socio_class': 'MIDDLE', 'nationality': 'AMERICAN', 'religion': 'NONE'}
+# A conditional GET of the index page from another process; prints the status
+OTHER_WORKER = """
+import sys
+from app import create_app
+from journal import Journal
+app = create_app({'TESTING': True, 'SECRET_KEY': 'test-secret', 'SESSION_STORE': 'sqlite', 'SESSION_DB': sys.argv[1]})
+client = app.test_client()
+client.set_cookie(app.config['SESSION_COOKIE_NAME'], sys.argv[2])
+print(client.get('/', headers={'If-None-Match': sys.argv[3]}).status_code)
+"""
+
+
+@pytest.fixture
+def config(tmp_path):
+    # Settings every worker shares: one secret and one session store
+    return {'TESTING': True, 'SECRET_KEY': 'test-secret', 'SESSION_STORE': 'sqlite',
+            'SESSION_DB': str(tmp_path / 'sessions.db'), 'ADVISOR_WORKERS': 1}
+
+
+def cookie(client):
+    return client.get_cookie(client.application.config['SESSION_COOKIE_NAME']).value
+
+
+def test_index_etag_holds_in_another_process(config):
+    client = create_app(config).test_client()
+    client.post('/character', data=CHARACTER)
+    etag = client.get('/').headers['ETag'].strip('"')
+    result = subprocess.run([sys.executable, '-c', OTHER_WORKER, config['SESSION_DB'], cookie(client), f'"{etag}"'],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '304'
+
+
+def play(client, years):
+    # Advances `years` years, taking the first option of any event on the way
+    for _ in range(years):
+        if client.post('/api/action', json={'action': 'advance'}).get_json()['event']:
+            client.post('/api/action', json={'action': 'choice', 'choice': 0})
+
+
+def state(client):
+    return client.get('/api/state').get_json()['state']
+
+
+def test_game_moves_between_workers(config):
+    first, second = (create_app(config).test_client() for _ in range(2))
+    first.post('/api/character', json=CHARACTER)
+    first.post('/api/action', json={'action': 'choice', 'choice': 0})
+    play(first, 5)
+    second.set_cookie(second.application.config['SESSION_COOKIE_NAME'], cookie(first))
+    started = state(first)
+    assert state(second) == started
+    play(second, 5)
+    continued = state(second)
+    player = str(started['player_id'])
+    assert continued['family']['people'][player]['age'] > started['family']['people'][player]['age']
+    assert state(first) == continued
+
+
+def test_requests_that_change_nothing_write_no_journal_entries(config, tmp_path):
+    client = create_app(dict(config, JOURNAL_DIR=str(tmp_path / 'journals'))).test_client()
+    client.post('/api/character', json=CHARACTER)
+    client.post('/api/action', json={'action': 'choice', 'choice': 0})
+    client.post('/api/action', json={'action': 'pause'})
+    with client.session_transaction() as session:
+        journal = Journal(str(tmp_path / 'journals' / f"{session['sid']}.journal"))
+    entries = list(journal.entries())
+    for _ in range(3):
+        client.post('/advance')
+        client.post('/api/action', json={'action': 'advance'})
+    assert list(journal.entries()) == entries
+
+
+@pytest.mark.parametrize('body', [[1, 2], "text", 5, dict(CHARACTER, first_name=5), dict(CHARACTER, religion=['NONE'])])
+def test_bad_character_bodies_are_rejected(config, body):
+    response = create_app(config).test_client().post('/api/character', json=body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+@pytest.mark.parametrize('body', [[1, 2], {'action': ['advance']}, {'action': 'choice', 'choice': -1},
+                                  {'action': 'choice', 'choice': [0]}, {'action': 'name', 'new_name': 5}])
+def test_bad_actions_are_rejected(config, body):
+    client = create_app(config).test_client()
+    client.post('/api/character', json=CHARACTER)
+    before = state(client)
+    response = client.post('/api/action', json=body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+    assert state(client) == before
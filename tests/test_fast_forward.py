@@ -0,0 +1,34 @@
+import pytest
+
+import metrics
+from events import registry
+from game_changer import LifeSimulator, SocioEconomicClass
+
+LAST_MILESTONE = max(registry.milestones)
+
+
+def fired_events(monkeypatch, seed, step):
+    fired = []
+    monkeypatch.setattr(metrics.EVENTS_TOTAL, 'inc', lambda amount=1, **labels: fired.append(labels['event']))
+    game = LifeSimulator(seed=seed)
+    game.create_character("Alex", "Smith", "Female", SocioEconomicClass.MIDDLE)
+    game.handle_choice(0)
+    while game.player.is_alive and game.player.age < LAST_MILESTONE:
+        if game.current_event:
+            game.handle_choice(0)
+        else:
+            game.paused = False
+            step(game)
+    return fired
+
+
+@pytest.mark.parametrize('step', [
+    LifeSimulator.update,
+    lambda game: game.fast_forward(50),
+    lambda game: game.fast_forward(3)
+], ids=['update', 'fast_forward_50', 'fast_forward_3'])
+@pytest.mark.parametrize('seed', range(20))
+def test_every_milestone_fires(monkeypatch, seed, step):
+    fired = fired_events(monkeypatch, seed, step)
+    for event_type in registry.milestones.values():
+        assert event_type.name in fired
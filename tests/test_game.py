@@ -0,0 +1,81 @@
+import random
+
+from game_changer import LifeSimulator, Person, SocioEconomicClass
+
+
+def new_game(seed=0):
+    game = LifeSimulator(seed=seed)
+    game.create_character("Alex", "Smith", "Female", SocioEconomicClass.MIDDLE)
+    game.handle_choice(0)
+    game.clear_dirty()
+    return game
+
+
+def test_steps_that_cannot_advance_leave_the_game_unchanged():
+    game = new_game()
+    game.paused = True
+    game.clear_dirty()
+    epoch = game.rng_epoch
+    game.update()
+    assert game.fast_forward() == []
+    assert game.rng_epoch == epoch
+    assert not game.is_dirty()
+
+
+def test_loading_old_saves_draws_no_random_numbers():
+    data = Person("Alex", "Smith", "Female", 1990).to_dict()
+    del data['health'], data['intelligence']
+    state = random.getstate()
+    person = Person.from_dict(data)
+    assert random.getstate() == state
+    assert (person.health, person.intelligence) == (80, 60)
+
+
+def test_career_outlives_retirement():
+    game = new_game()
+    game.player.job, game.player.salary = 'Teacher', 3000
+    game.player.age = 60
+    game.update_stats()
+    assert game.player.job is None
+    assert game.career == 'Teacher'
+    assert LifeSimulator.from_dict(game.to_dict()).career == 'Teacher'
+
+
+def test_babies_of_one_parent_are_different_people():
+    game = new_game()
+    babies = [game.candidate(game.match(0, 0)) for _ in range(20)]
+    assert len({(b.first_name, b.gender, b.health, b.intelligence) for b in babies}) >= 18
+
+
+def test_dating_gives_the_partner_shown():
+    game = new_game()
+    game.player.age = 25
+    game.relationship_event()
+    shown = game.current_event['description'].split(" meets ")[1].split(" at a ")[0]
+    game.handle_choice(0)
+    assert game.player.spouse.full_name() == shown
+
+
+def test_fork_leaves_the_parent_player_alone():
+    game = new_game()
+    for _ in range(3):
+        game.player.add_child(game.generate_person(age=1))
+    player = game.player
+    before = game.to_dict()
+    branch = game.fork()
+    assert game.player is player
+    assert game.family[player.id] is player
+    branch.player.wealth += 1000
+    branch.family[branch.player.children[0].id].health = 1
+    branch.fast_forward(5)
+    assert game.player is player
+    assert game.to_dict() == before
+    player.wealth -= 1000
+    assert branch.player.wealth != player.wealth
+
+
+def test_fork_shares_the_family_until_read_whole():
+    game = new_game()
+    branch = game.fork()
+    branch.player.health = 1
+    assert branch.family._people is game.family._people
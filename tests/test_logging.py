@@ -0,0 +1,18 @@
+import logging
+
+from app import create_app
+from logging_setup import RouteSampler, parse_rates
+
+
+def sampled(app, path, method='GET'):
+    sampler = RouteSampler(parse_rates('index=0,advance_year=0,*=1'))
+    record = logging.LogRecord('test', logging.DEBUG, __file__, 0, "trace", None, None)
+    with app.test_request_context(path, method=method):
+        return sampler.filter(record)
+
+
+def test_sample_rates_name_routes_without_their_blueprint():
+    app = create_app({'TESTING': True, 'SECRET_KEY': 'test-secret'})
+    assert not sampled(app, '/')
+    assert not sampled(app, '/advance', 'POST')
+    assert sampled(app, '/api/state')
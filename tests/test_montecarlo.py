@@ -0,0 +1,7 @@
+import montecarlo
+
+
+def test_jobs_count_the_career_not_the_job_at_death():
+    jobs = montecarlo.run(100, workers=1, policy=montecarlo.random_choice).to_dict()['jobs']
+    assert len(jobs) > 1
+    assert jobs.get('None', 0) < 50
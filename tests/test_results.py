@@ -0,0 +1,11 @@
+import montecarlo
+from results import ResultsStore
+
+
+def test_job_column_holds_the_last_career(tmp_path):
+    montecarlo.run(100, workers=1, policy=montecarlo.random_choice, results=str(tmp_path))
+    store = ResultsStore(str(tmp_path))
+    jobs = store.group_by('job')
+    assert len(store) == 100
+    assert len(jobs) > 1
+    assert jobs.get('None', {'count': 0})['count'] < 50
@@ -0,0 +1,136 @@
+import json
+
+import pytest
+
+import session_store
+from game_changer import LifeSimulator, SocioEconomicClass
+from journal import Journal
+from session_store import MemoryStore, SQLiteStore, load_game, load_state, save_game
+
+
+class Clock:
+    # Stands in for the time module in session_store
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_store, 'time', clock)
+    return clock
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryStore()
+    return SQLiteStore(str(tmp_path / 'sessions.db'))
+
+
+def plain(state):
+    return json.loads(json.dumps(state))
+
+
+def unversioned(state):
+    # The journal keeps history, not the session store's state_version
+    state = plain(state)
+    del state['state_version']
+    return state
+
+
+def step(game):
+    # One request's worth of play: a choice if an event waits, else a year
+    if game.current_event:
+        game.handle_choice(0)
+    else:
+        game.update()
+
+
+def new_game(seed=0):
+    game = LifeSimulator(seed=seed)
+    game.create_character("Alex", "Smith", "Female", SocioEconomicClass.MIDDLE)
+    return game
+
+
+def test_snapshot_and_deltas_load_back_as_the_game(store):
+    game = new_game()
+    for _ in range(2 * session_store.SNAPSHOT_EVERY + 5):
+        save_game(store, 'sid', game)
+        data, deltas = load_state(store, 'sid')
+        assert plain(data) == plain(game.to_dict())
+        assert deltas == game.deltas_since_snapshot
+        step(game)
+    save_game(store, 'sid', game)
+    loaded = load_game(store, 'sid', LifeSimulator)
+    step(loaded)
+    step(game)
+    assert plain(loaded.to_dict()) == plain(game.to_dict())
+
+
+def test_memory_sessions_expire_after_the_ttl(clock):
+    store = MemoryStore(ttl=60)
+    store.set('old', {'n': 1})
+    clock.now += 30
+    assert store.load('old') == ({'n': 1}, 0)
+    clock.now += 61
+    assert store.load('old') is None
+    assert not store.append('old', {'n': 2})
+    store.set('a', {})
+    clock.now += 61
+    store.set('b', {})
+    assert len(store) == 1
+
+
+def test_memory_store_evicts_the_least_recently_used(clock):
+    store = MemoryStore(max_entries=2)
+    store.set('a', {})
+    store.set('b', {})
+    store.load('a')
+    store.set('c', {})
+    assert store.load('b') is None
+    assert store.load('a') is not None and store.load('c') is not None
+
+
+def test_sqlite_sessions_expire_and_are_purged(clock, tmp_path):
+    store = SQLiteStore(str(tmp_path / 'sessions.db'), ttl=60)
+    store.set('old', {'n': 1})
+    assert store.append('old', {'n': 2})
+    clock.now += 30
+    assert store.load('old') == ({'n': 2}, 1)
+    clock.now += 61
+    assert store.load('old') is None
+    assert not store.append('old', {'n': 3})
+    clock.now += SQLiteStore.PURGE_INTERVAL
+    store.set('new', {})
+    db = store._connect()
+    assert db.execute("SELECT sid FROM games").fetchall() == [('new',)]
+    assert db.execute("SELECT count(*) FROM game_deltas").fetchone() == (0,)
+
+
+def test_journal_replay_reproduces_every_year(tmp_path):
+    path = str(tmp_path / 'game.journal')
+    store = MemoryStore()
+    game = LifeSimulator(seed=3)
+    game.journal = Journal(path)
+    game.create_character("Alex", "Smith", "Female", SocioEconomicClass.MIDDLE)
+    save_game(store, 'sid', game)
+    expected = {}
+    for _ in range(120):
+        # One request: load, attach the journal, play, save (which syncs it)
+        game = load_game(store, 'sid', LifeSimulator)
+        game.journal = Journal(path)
+        if not game.player.is_alive:
+            break
+        step(game)
+        save_game(store, 'sid', game)
+        expected[game.current_year] = unversioned(game.to_dict())
+    assert len(expected) > 50
+    for year, state in expected.items():
+        assert unversioned(game.journal.state_at(year)) == state
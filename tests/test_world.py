@@ -0,0 +1,57 @@
+import random
+
+import numpy as np
+import pytest
+
+import world
+from game_changer import WORLD_TABLES, LifeSimulator, SocioEconomicClass
+
+JOBS = ['Teacher', 'Doctor', 'Actor', 'Politician', 'Athlete']
+
+
+def family_world(seed, ages, employed=True):
+    game = LifeSimulator(seed=seed)
+    game.create_character("Alex", "Smith", "Female", SocioEconomicClass.MIDDLE)
+    game.player.age = 30
+    rng = random.Random(seed)
+    for age in ages:
+        child = game.generate_person(age=age)
+        if employed and 20 <= age < 60:
+            child.job = rng.choice(JOBS)
+            child.salary = rng.randint(1000, 5000)
+        child.health = rng.uniform(10, 100)
+        game.player.add_child(child)
+    return world.World(WORLD_TABLES, game.family, game.player)
+
+
+def columns(w):
+    w.flush()
+    return {p.id: (p.age, p.health, p.intelligence, p.charisma, p.wealth, p.job) for p in w.family.people}
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_quiet_runs_match_yearly_ticks(seed):
+    # No job seekers, so both ways draw the same numbers
+    ages = random.Random(seed).sample(range(20, 95), 6)
+    ticked, skipped = family_world(seed, ages), family_world(seed, ages)
+    rng_ticked, rng_skipped = random.Random(seed), random.Random(seed)
+    died = []
+    for _ in range(25):
+        died += ticked.tick(rng_ticked)
+    assert skipped.advance(rng_skipped, 25) == died
+    assert rng_skipped.getstate() == rng_ticked.getstate()
+    for a, b in zip(columns(ticked).values(), columns(skipped).values()):
+        assert a[0] == b[0] and a[5] == b[5]
+        assert np.allclose(a[1:5], b[1:5])
+
+
+def test_skipped_years_hire_job_seekers_at_the_yearly_rate():
+    years = 10
+    hired = 0
+    for seed in range(400):
+        w = family_world(seed, [25], employed=False)
+        w.health[:] = 90
+        w.advance(random.Random(seed), years)
+        hired += w.job[0] != 0
+    expected = 1 - (1 - WORLD_TABLES.rules.events['job'].chance) ** years
+    assert abs(hired / 400 - expected) < 0.07
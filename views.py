@@ -0,0 +1,93 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from game_changer import RULES
+
+# View model for the index page, built straight from the stored state dict so
+# that showing a page never rebuilds a LifeSimulator. Views and rendered
+# fragments are cached per (session id, state_version); a new version is saved
+# whenever the game changes, so entries never need invalidating and simply age
+# out of the LRU.
+
+STATS = (('Health', 'health', 'bg-success'), ('Happiness', 'happiness', 'bg-info'),
+         ('Intelligence', 'intelligence', 'bg-warning'), ('Charisma', 'charisma', 'bg-danger'))
+
+
+def etag(view_version, sid, version):
+    # view_version changes with the templates, so cached pages revalidate
+    # after a deploy but stay valid across workers and restarts
+    return hashlib.blake2b(f"{view_version}:{sid}:{version}".encode(), digest_size=12).hexdigest()
+
+
+def template_version(folder):
+    # Digest of every template file under `folder`
+    digest = hashlib.blake2b(digest_size=8)
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, folder).encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def socio_class(family_wealth):
+    for c, max_family_wealth in RULES.class_thresholds:
+        if max_family_wealth is None or family_wealth < max_family_wealth:
+            return c
+
+
+def build_view(state):
+    family = state['family']
+    player_id = state['player_id']
+    player = family['people'][str(player_id)]
+    code, symbol = RULES.currency.get(RULES.nationality_by_name.get(player['nationality']), RULES.default_currency)
+    spouse_id = family['spouses'][player_id]
+    spouse = family['people'][str(spouse_id)] if spouse_id is not None else None
+    return {
+        'player_id': player_id,
+        'full_name': f"{player['first_name']} {player['last_name']}",
+        'age': player['age'],
+        'gender': player['gender'],
+        'nationality': player['nationality'],
+        'religion': player['religion'],
+        'socio_class': socio_class(player['family_wealth']).name,
+        'generation': state['generation'],
+        'wealth': f"{symbol}{int(player['wealth']):,} {code}",
+        'family_wealth': f"{symbol}{int(state['family_assets']):,} {code}",
+        'job': player['job'],
+        'salary': f"{symbol}{int(player['salary'])}/month",
+        'spouse': f"{spouse['first_name']} {spouse['last_name']}" if spouse else None,
+        'children': sum(player_id in parents for parents in family['parents']),
+        'stats': [(label, player[key], round(player[key], 1), css) for label, key, css in STATS],
+        'notifications': list(state['notifications']),
+        'event': state['current_event'],
+        'paused': state['paused'],
+        'game_speed': state['game_speed']
+    }
+
+
+class ViewCache:
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                return value
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,371 @@
+import numpy as np
+
+# Living-world engine: every family member other than the player (NPCs) is
+# aged each year in one batched pass, with the player's aging, salary,
+# retirement, job and death rules. Their stats are kept as columns (structure
+# of arrays, one row per living NPC) between ticks and only written back to the
+# Person objects by flush(), so a tick costs a fixed number of array operations
+# however large the dynasty grows. Skipped years go through advance(), which
+# applies quiet runs in closed form. Draws come from the game's own RNG so a
+# saved game still replays identically.
+
+COLUMNS = ('age', 'health', 'intelligence', 'charisma', 'wealth', 'salary')
+STATS = ('health', 'intelligence', 'charisma')
+
+
+class Tables:
+    # Rule lookups as arrays, built once per rules
+    def __init__(self, rules):
+        self.rules = rules
+        # Class index per row is found by bisecting the wealth thresholds
+        self.classes = [c for c, _ in rules.class_thresholds]
+        self.limits = np.array([limit for _, limit in rules.class_thresholds[:-1]], dtype=np.float64)
+        self.health_mod = np.array([rules.classes[c].health_mod for c in self.classes])
+        self.wealth_mod = np.array([rules.classes[c].wealth_mod for c in self.classes])
+        self.death_mod = np.array([rules.classes[c].death_mod for c in self.classes])
+        # Job codes: 0 is unemployed
+        self.job_names = [None]
+        for job in list(rules.starter_jobs.values()) + [j for r in rules.classes.values() for j in r.jobs] + [b.job for b in rules.bonus_jobs]:
+            if job.name not in self.job_names:
+                self.job_names.append(job.name)
+        self.job_codes = {name: code for code, name in enumerate(self.job_names)}
+        # Yearly stat gain per job code, per stat
+        self.job_gains = {}
+        for name, effects in rules.job_effects.items():
+            for stat, amount in effects:
+                if name in self.job_codes:
+                    self.job_gains.setdefault(stat, np.zeros(len(self.job_names)))[self.job_codes[name]] += amount
+        # Ages at which some yearly rule starts or stops applying, ending with
+        # a sentinel; quiet runs never cross one
+        aging, death, job = rules.aging, rules.death, rules.events['job']
+        bounds = {aging['youth_until'], aging['decline_after'] + 1, aging['elderly_after'] + 1, rules.retirement['age'],
+                  job.min_age, job.max_age + 1, death['min_age'], death['max_age']}
+        self.bounds = np.array(sorted(bounds) + [np.iinfo(np.int64).max], dtype=np.int64)
+        # Per band between bounds (indexed by searchsorted on the bounds): the
+        # yearly stat rises and falls per class and job code, and which rules
+        # can fire
+        starts = np.array([0] + sorted(bounds))
+        shape = (len(starts), len(self.classes), len(self.job_names))
+        rises = {stat: np.zeros(shape) for stat in STATS}
+        falls = {stat: np.zeros(shape) for stat in STATS}
+        for band, age in enumerate(starts.tolist()):
+            for index, name in enumerate(self.classes):
+                health_mod = rules.classes[name].health_mod
+                changes = []
+                if age < aging['youth_until']:
+                    youth = aging['youth']
+                    changes += [('intelligence', youth['intelligence']), ('health', youth['health'] + health_mod), ('charisma', youth['charisma'])]
+                if age > aging['decline_after']:
+                    changes.append(('health', -aging['decline'] - health_mod))
+                if age > aging['elderly_after']:
+                    changes.append(('health', -aging['elderly'] - health_mod))
+                for stat, amount in changes:
+                    (rises if amount > 0 else falls)[stat][band, index] += amount
+        for stat, gains in self.job_gains.items():
+            rises[stat] += np.maximum(gains, 0)
+            falls[stat] += np.minimum(gains, 0)
+        # Flattened for one lookup per stat: (stat, yearly change, whether it
+        # is pushed both ways, falls), for the stats any rule changes
+        self.drifts = []
+        for stat in STATS:
+            rise, fall = rises[stat].ravel(), falls[stat].ravel()
+            if rise.any() or fall.any():
+                self.drifts.append((stat, rise + fall, (rise > 0) & (fall < 0), fall))
+        self.ends = starts >= death['max_age']
+        self.retires = starts >= rules.retirement['age']
+        self.can_die = starts >= death['min_age']
+        self.seeks = (starts >= job.min_age) & (starts <= job.max_age) & ~self.retires
+
+    def class_index(self, family_wealth):
+        return np.searchsorted(self.limits, family_wealth, side='right')
+
+
+class World:
+    def __init__(self, tables, family, player):
+        self.tables = tables
+        self.family = family
+        self.player_id = player.id if player else None
+        self.family_size = len(family)
+        self.stale = False
+        npcs = [p for p in family.people if p.is_alive and p.id != self.player_id]
+        self.ids = np.array([p.id for p in npcs], dtype=np.int64)
+        for name in COLUMNS:
+            setattr(self, name, np.array([getattr(p, name) for p in npcs], dtype=np.float64))
+        self.age = self.age.astype(np.int64)
+        self.job_names = tables.job_names
+        self.job = np.array([self.job_code(p.job) for p in npcs], dtype=np.int16)
+        self.socio = tables.class_index(np.array([p.family_wealth for p in npcs], dtype=np.float64))
+        # Years ticked so far; refresh_rates() results hold until rates_until
+        self.elapsed = 0
+        self.refresh_rows()
+
+    @property
+    def size(self):
+        return len(self.ids)
+
+    def current(self, family, player):
+        # False once people joined the family or the player changed
+        return family is self.family and len(family) == self.family_size and (player.id if player else None) == self.player_id
+
+    def refresh_rows(self):
+        # Per-row class modifiers and the age range, recomputed only when
+        # rows are dropped; the range then moves with every tick
+        self.youngest = int(self.age.min()) if self.size else 0
+        self.oldest = int(self.age.max()) if self.size else 0
+        self.health_mod = self.tables.health_mod[self.socio]
+        self.wealth_mod = self.tables.wealth_mod[self.socio]
+        self.death_mod = self.tables.death_mod[self.socio]
+        self.refresh_jobs()
+
+    def refresh_jobs(self):
+        # Yearly income, the number of unemployed and the per-row job stat
+        # gains; recomputed only when someone is hired or retires
+        self.idle = int((self.job == 0).sum())
+        self.income = self.salary / 12 * self.wealth_mod if self.idle < self.size else None
+        self.job_gains = []
+        for stat, table in self.tables.job_gains.items():
+            if len(table) < len(self.job_names):
+                table = np.concatenate([table, np.zeros(len(self.job_names) - len(table))])
+            gain = table[self.job]
+            if gain.any():
+                self.job_gains.append((stat, gain))
+        self.rates_until = self.elapsed
+
+    def job_code(self, name):
+        if name is None:
+            return 0
+        code = self.tables.job_codes.get(name)
+        if code is None:
+            # A job the rules do not list: give it a code local to this world
+            if self.job_names is self.tables.job_names:
+                self.job_names = list(self.job_names)
+            if name not in self.job_names:
+                self.job_names.append(name)
+            code = self.job_names.index(name)
+        return code
+
+    def advance(self, rng, years):
+        # `years` ticks; returns the ids of those who died. Runs of quiet years
+        # are applied in closed form, like the player's drift; the years
+        # between them are ticked.
+        died = []
+        while years > 0 and self.size:
+            quiet, drift, hired = self.quiet_years(rng, years) if years > 1 else (0, None, None)
+            if quiet:
+                self.drift(drift, quiet)
+                years -= quiet
+            if years and (hired is not None or not quiet):
+                died.extend(self.tick(rng, hired))
+                years -= 1
+        return died
+
+    def quiet_years(self, rng, years):
+        # Number of coming years (at most `years`) in which a tick would only
+        # apply fixed stat drift and income: no row reaches an age where a
+        # rule changes, retires, is hired or can die. Job seekers get one
+        # geometric draw each for the years until they are hired, so a hire
+        # ends the run and its rows are returned for the next tick to take on.
+        # Returns (years, per-row yearly drift, rows hired in the year after).
+        if self.elapsed >= self.rates_until:
+            self.refresh_rates()
+        drift, bounded, adults, health_change, seeking = self.rates
+        if drift is None:
+            return 0, None, None
+        limit = min(years, self.rates_until - self.elapsed)
+        for stat, rows, fall, change in bounded:
+            # Rows with a stat pushed both ways: closed form only while
+            # neither the falls reach 0 nor a year's change passes 100
+            values = getattr(self, stat)[rows]
+            if ((values + fall < 0) | (values + change > 100)).any():
+                return 0, None, None
+            down, up = change < 0, change > 0
+            if down.any():
+                limit = min(limit, int(((values[down] + fall[down]) / -change[down]).min()) + 1)
+            if up.any():
+                limit = min(limit, int(((100 - values[up]) / change[up]).min()))
+        if len(adults):
+            health = self.health[adults]
+            threshold = self.tables.rules.death['health_threshold']
+            if (health + health_change < threshold).any():
+                return 0, None, None
+            falling = health_change < 0
+            if falling.any():
+                limit = min(limit, int(((health[falling] - threshold) / -health_change[falling]).min()))
+                if limit <= 0:
+                    return 0, None, None
+        if len(seeking):
+            chance = self.tables.rules.events['job'].chance
+            if chance >= 1:
+                return 0, drift, seeking
+            if chance > 0:
+                draws = np.array([rng.random() for _ in range(len(seeking))])
+                waits = np.floor(np.log(1.0 - draws) / np.log(1.0 - chance))
+                first = waits.min()
+                if first < limit:
+                    return int(first), drift, seeking[waits == first]
+        return limit, drift, None
+
+    def refresh_rates(self):
+        # What quiet_years() needs that only changes when a row's age crosses
+        # a rule bound or jobs change: the per-row yearly stat drift at next
+        # year's ages (None when some row retires or reaches the maximum age),
+        # the rows with a stat pushed both ways, the rows that can die with
+        # their yearly health change, and the job seekers
+        tables = self.tables
+        age = self.age + 1
+        band = tables.bounds.searchsorted(age, side='right')
+        self.rates_until = self.elapsed + int((tables.bounds[band] - age).min())
+        working = self.job != 0
+        if tables.ends[band].any() or (tables.retires[band] & working).any():
+            self.rates = None, None, None, None, None
+            return
+        job = self.job
+        if len(self.job_names) > len(tables.job_names):
+            job = np.where(job < len(tables.job_names), job, 0)
+        cell = (band * len(tables.classes) + self.socio) * len(tables.job_names) + job
+        drift = []
+        bounded = []
+        health = np.zeros(self.size)
+        for stat, changes, mixed, falls in tables.drifts:
+            change = changes.take(cell)
+            if not change.any():
+                continue
+            drift.append((stat, change))
+            if stat == 'health':
+                health = change
+            rows = mixed.take(cell).nonzero()[0]
+            if len(rows):
+                bounded.append((stat, rows, falls.take(cell[rows]), change[rows]))
+        adults = tables.can_die[band].nonzero()[0]
+        seeking = (tables.seeks[band] & ~working).nonzero()[0] if self.idle else adults[:0]
+        self.rates = drift, bounded, adults, health[adults], seeking
+
+    def drift(self, drift, years):
+        # Closed form of `years` quiet ticks. A stat that moves in one
+        # direction is clamped once, as the total equals clamping every year;
+        # quiet_years() kept the others away from the clamps.
+        self.stale = True
+        self.elapsed += years
+        self.age += years
+        self.youngest += years
+        self.oldest += years
+        for stat, change in drift:
+            column = getattr(self, stat)
+            column += change * years
+            np.minimum(np.maximum(column, 0, out=column), 100, out=column)
+        if self.income is not None:
+            self.wealth += self.income * years
+
+    def tick(self, rng, hired=None):
+        # One year for every NPC; returns the ids of those who died. Rules
+        # are skipped outright when no row's age is in their range, which
+        # keeps small families cheap. `hired` are job seekers already drawn
+        # by quiet_years() to be hired this year.
+        rules = self.tables.rules
+        self.stale = True
+        self.elapsed += 1
+        self.age += 1
+        self.youngest += 1
+        self.oldest += 1
+        age = self.age
+        youngest, oldest = self.youngest, self.oldest
+
+        aging = rules.aging
+        if youngest < aging['youth_until']:
+            youth = age < aging['youth_until']
+            gains = aging['youth']
+            self.intelligence[youth] = np.minimum(100, self.intelligence[youth] + gains['intelligence'])
+            self.health[youth] = np.minimum(100, self.health[youth] + gains['health'] + self.health_mod[youth])
+            self.charisma[youth] = np.minimum(100, self.charisma[youth] + gains['charisma'])
+        if oldest > aging['decline_after']:
+            decline = age > aging['decline_after']
+            self.health[decline] = np.maximum(0, self.health[decline] - aging['decline'] - self.health_mod[decline])
+            if oldest > aging['elderly_after']:
+                elderly = age > aging['elderly_after']
+                self.health[elderly] = np.maximum(0, self.health[elderly] - aging['elderly'] - self.health_mod[elderly])
+
+        retirement = rules.retirement
+        if oldest >= retirement['age']:
+            retiring = np.flatnonzero((age >= retirement['age']) & (self.job != 0))
+            if len(retiring):
+                self.job[retiring] = 0
+                self.salary[retiring] = 0
+                wealth = self.wealth[retiring]
+                pension = np.minimum(wealth * retirement['pension_rate'], retirement['pension_cap'])
+                self.wealth[retiring] += np.where(wealth > 0, pension, 0)
+                self.refresh_jobs()
+
+        if self.income is not None:
+            self.wealth += self.income
+            for stat, gain in self.job_gains:
+                column = getattr(self, stat)
+                np.minimum(100, column + gain, out=column, where=gain > 0)
+
+        job_rules = rules.events['job']
+        if hired is None and oldest >= job_rules.min_age and youngest <= job_rules.max_age and self.idle:
+            seeking = np.flatnonzero((self.job == 0) & (age >= job_rules.min_age) & (age <= job_rules.max_age) & (age < retirement['age']))
+            if len(seeking):
+                hired = seeking[np.array([rng.random() for _ in range(len(seeking))]) < job_rules.chance]
+        if hired is not None and len(hired):
+            for row in hired.tolist():
+                self.hire(row, rng)
+            self.refresh_jobs()
+
+        return self.check_death(rng, oldest)
+
+    def hire(self, row, rng):
+        # A random job of the NPC's class, or a bonus job they qualify for
+        rules = self.tables.rules
+        socio_class = self.tables.classes[self.socio[row]]
+        job = rng.choice(rules.classes[socio_class].jobs)
+        for bonus in rules.bonus_jobs:
+            if socio_class in bonus.classes and all(getattr(self, stat)[row] >= minimum for stat, minimum in bonus.minimums):
+                job = bonus.job
+        self.job[row] = self.job_code(job.name)
+        self.salary[row] = job.salary
+
+    def check_death(self, rng, oldest):
+        death = self.tables.rules.death
+        threshold = death['health_threshold']
+        if oldest < death['max_age'] and (oldest < death['min_age'] or self.health.min() >= threshold):
+            return []
+        age = self.age
+        died = age >= death['max_age']
+        at_risk = np.flatnonzero(~died & (self.health < threshold) & (age >= death['min_age']))
+        if len(at_risk):
+            chance = (threshold - self.health[at_risk]) * death['health_factor'] + (age[at_risk] - death['min_age']) * death['age_factor']
+            chance *= self.death_mod[at_risk]
+            draws = np.array([rng.random() for _ in range(len(at_risk))])
+            died[at_risk[draws < chance]] = True
+        if not died.any():
+            return []
+        return self.bury(died)
+
+    def bury(self, died):
+        # Writes the dead back at once and drops their rows
+        rows = np.flatnonzero(died)
+        self.write(rows)
+        ids = self.ids[rows].tolist()
+        for person_id in ids:
+            self.family[person_id].is_alive = False
+        keep = ~died
+        for name in COLUMNS + ('job', 'socio', 'ids'):
+            setattr(self, name, getattr(self, name)[keep])
+        self.refresh_rows()
+        return ids
+
+    def write(self, rows):
+        family = self.family
+        columns = [(name, getattr(self, name)[rows].tolist()) for name in COLUMNS]
+        jobs = self.job[rows].tolist()
+        for i, person_id in enumerate(self.ids[rows].tolist()):
+            person = family[person_id]
+            for name, values in columns:
+                setattr(person, name, values[i])
+            person.job = self.job_names[jobs[i]]
+
+    def flush(self):
+        # Writes the columns back to the Person objects
+        if self.stale:
+            self.write(np.arange(self.size))
+            self.stale = False